@@ -1,93 +1,45 @@
 """AI integration for intelligent config generation using Google Vertex AI."""
 
+import asyncio
 import os
+import random
+import re
+import time
+import tomllib
+from functools import cached_property
 from pathlib import Path
-from typing import Optional
+from typing import Awaitable, Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
 import google.genai as genai
+from google.genai import errors as genai_errors
 
 from .vhdl_parser import VhdlParser, VhdlEntity
-from .config import save_config, TestbenchConfig
+from .config import save_config, generate_baseline_config, TestbenchConfig
 
 
-class AIConfigGenerator:
-    """AI-powered configuration generator using Google Vertex AI."""
+T = TypeVar('T')
 
-    def __init__(self, project_id: Optional[str] = None, location: Optional[str] = None):
-        """Initialize AI config generator."""
-        self.project_id = project_id or os.getenv("GOOGLE_CLOUD_PROJECT")
-        self.location = location or os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1")
-        
-        if not self.project_id:
-            raise ValueError(
-                "Google Cloud project ID required. Set GOOGLE_CLOUD_PROJECT environment variable "
-                "or pass project_id parameter."
-            )
-        
-        # Initialize Vertex AI client
-        self.client = genai.Client(
-            vertexai=True,
-            project=self.project_id,
-            location=self.location
-        )
+# Client error codes worth retrying (request timeout, quota exhausted)
+_RETRYABLE_CLIENT_ERROR_CODES = frozenset({408, 429})
 
-    def generate_config(
-        self, 
-        vhdl_file: Path, 
-        additional_prompt: Optional[str] = None,
-        verbose: bool = False
-    ) -> TestbenchConfig:
-        """Generate intelligent configuration using AI."""
-        
-        # Parse VHDL file to understand the entity
-        if verbose:
-            print(f"Parsing VHDL file: {vhdl_file}")
-        
-        entity = VhdlParser.parse_file(vhdl_file)
-        vhdl_content = vhdl_file.read_text(encoding='utf-8')
-        
-        # Read README for context
-        readme_path = Path(__file__).parent.parent / "README.md"
-        readme_content = ""
-        if readme_path.exists():
-            readme_content = readme_path.read_text(encoding='utf-8')
-        
-        # Construct the prompt
-        prompt = self._build_prompt(entity, vhdl_content, readme_content, additional_prompt)
-        
-        if verbose:
-            print("Generating AI-powered configuration...")
-        
-        # Generate response from Vertex AI
-        try:
-            response = self.client.models.generate_content(
-                model='gemini-2.5-pro',
-                contents=prompt
-            )
-            
-            if verbose:
-                print("AI response received, parsing configuration...")
-            
-            # Parse the AI response to extract configuration
-            config = self._parse_ai_response(response.text, entity)
-            
-            return config
-            
-        except Exception as e:
-            raise RuntimeError(f"Failed to generate AI configuration: {e}")
+# Start of the first line that is clearly TOML: a section, a comment or a key-value pair
+_TOML_START_RE = re.compile(r'^[^\S\n]*(?:[\[#]|[^\n]*=)', re.MULTILINE)
 
-    def _build_prompt(
-        self, 
-        entity: VhdlEntity, 
-        vhdl_content: str, 
-        readme_content: str,
-        additional_prompt: Optional[str] = None
-    ) -> str:
-        """Build the prompt for Gemini."""
-        
-        prompt = f"""You are an expert VHDL testbench designer. I need you to analyze a VHDL entity and generate an intelligent testbench configuration.
+# A line that is a key-value pair (not commented out) or a [section] header
+_TOML_LINE_RE = re.compile(r'^[^\S\n]*+(?:(?!#)[^\n]*=|\[[^\n]*\][^\S\n]*$)', re.MULTILINE)
+
+# Opening fence of a TOML code block in any case, e.g. "```TOML"
+_TOML_FENCE_RE = re.compile(r'```toml', re.IGNORECASE)
+
+# Line prefixes kept by _clean_trailing_text even without a '='
+_TOML_LINE_PREFIXES = ('#', '[', 'description', 'time_ns')
+
+# Fixed prompt sections that do not depend on the entity
+_PROMPT_HEADER = """You are an expert VHDL testbench designer. I need you to analyze a VHDL entity and generate an intelligent testbench configuration.
 
 ## Context - Tool Documentation:
-{readme_content}
+"""
+
+_PROMPT_ENTITY_SECTION = """
 
 ## VHDL Entity to Test:
 ```vhdl
@@ -95,11 +47,13 @@ class AIConfigGenerator:
 ```
 
 ## Entity Analysis:
-- Name: {entity.name}
-- Generics: {len(entity.generics)} ({', '.join(g.name for g in entity.generics)})
-- Ports: {len(entity.ports)} ({', '.join(f"{p.name}({p.direction})" for p in entity.ports)})
+- Name: {entity_name}
+- Generics: {generic_count} ({generic_names})
+- Ports: {port_count} ({port_names})
+
+"""
 
-## Task:
+_PROMPT_TASK = """## Task:
 Generate a comprehensive testbench configuration in TOML format that includes:
 
 1. **Appropriate timing parameters** based on the entity type and complexity
@@ -125,10 +79,7 @@ Generate a comprehensive testbench configuration in TOML format that includes:
 
 """
 
-        if additional_prompt:
-            prompt += f"\n## Additional Requirements:\n{additional_prompt}\n"
-
-        prompt += """
+_PROMPT_OUTPUT_FORMAT = """
 ## Output Format:
 ABSOLUTELY CRITICAL: You must respond with ONLY a TOML code block. No explanations, no introductions, no conclusions.
 
@@ -182,19 +133,214 @@ signal = "value"
 output = "value"
 ```
 """
+
+
+class AIConfigGenerator:
+    """AI-powered configuration generator using Google Vertex AI."""
+
+    def __init__(
+        self,
+        project_id: Optional[str] = None,
+        location: Optional[str] = None,
+        max_retries: int = 2
+    ):
+        """Initialize AI config generator."""
+        self.project_id = project_id or os.getenv("GOOGLE_CLOUD_PROJECT")
+        self.location = location or os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1")
+        self.max_retries = max_retries
         
-        return prompt
+        if not self.project_id:
+            raise ValueError(
+                "Google Cloud project ID required. Set GOOGLE_CLOUD_PROJECT environment variable "
+                "or pass project_id parameter."
+            )
+        
+        # Entity parsed by the most recent generate_config call
+        self.last_entity: Optional[VhdlEntity] = None
 
-    def _parse_ai_response(self, response_text: str, entity: VhdlEntity) -> TestbenchConfig:
-        """Parse AI response and convert to TestbenchConfig."""
-        import tomllib
+    def generate_config(
+        self, 
+        vhdl_file: Path, 
+        additional_prompt: Optional[str] = None,
+        verbose: bool = False
+    ) -> TestbenchConfig:
+        """Generate intelligent configuration using AI."""
         
-        # Extract TOML content from the response
-        toml_content = self._extract_toml_from_response(response_text)
+        # Parse VHDL file to understand the entity
+        if verbose:
+            print(f"Parsing VHDL file: {vhdl_file}")
         
+        vhdl_content, entity = VhdlParser.parse_file_with_source(vhdl_file)
+        self.last_entity = entity
+        
+        # Read README for context
+        readme_content = self._readme
+        
+        # Construct the prompt
+        prompt = self._build_prompt(entity, vhdl_content, readme_content, additional_prompt)
+        
+        if verbose:
+            print("Generating AI-powered configuration...")
+        
+        # Stream the response from Vertex AI so parsing can start as soon as
+        # the TOML block is complete instead of waiting for the full reply
         try:
-            # Parse the TOML content
-            data = tomllib.loads(toml_content)
+            response_text, toml_block = self._call_with_retries(
+                lambda: self._collect_stream(self.client.models.generate_content_stream(
+                    model='gemini-2.5-pro',
+                    contents=prompt
+                ))
+            )
+            
+            if verbose:
+                print("AI response received, parsing configuration...")
+            
+            # Happy path: the fenced block parses directly
+            if toml_block is not None:
+                try:
+                    return TestbenchConfig.from_dict(tomllib.loads(toml_block))
+                except Exception:
+                    pass  # Fall back to the tolerant extraction below
+            
+            # Parse the AI response to extract configuration
+            config = self._parse_ai_response(response_text, entity)
+            
+            return config
+            
+        except Exception as e:
+            raise RuntimeError(f"Failed to generate AI configuration: {e}")
+
+    def _call_with_retries(self, request: Callable[[], T]) -> T:
+        """Run a Gemini request, retrying transient failures with backoff."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return request()
+            except Exception as e:
+                if attempt == self.max_retries or not _is_transient_error(e):
+                    raise
+                time.sleep(_retry_delay(attempt))
+
+    async def _acall_with_retries(self, request: Callable[[], Awaitable[T]]) -> T:
+        """Async variant of _call_with_retries."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await request()
+            except Exception as e:
+                if attempt == self.max_retries or not _is_transient_error(e):
+                    raise
+                await asyncio.sleep(_retry_delay(attempt))
+
+    @cached_property
+    def client(self) -> genai.Client:
+        """Vertex AI client, created on first request rather than at construction."""
+        return genai.Client(
+            vertexai=True,
+            project=self.project_id,
+            location=self.location
+        )
+
+    @cached_property
+    def _readme(self) -> str:
+        """Tool README used as prompt context, read once per generator."""
+        readme_path = Path(__file__).parent.parent / "README.md"
+        if readme_path.exists():
+            return readme_path.read_text(encoding='utf-8')
+        return ""
+
+    @staticmethod
+    def _collect_stream(stream: Iterable) -> Tuple[str, Optional[str]]:
+        """Accumulate streamed chunks until the ```toml block is closed.
+        
+        Returns the text received so far and the fenced TOML body, or None
+        for the body if the stream ended without a complete block.
+        """
+        # Chunks are kept as pieces and joined once; only the new chunk plus
+        # a few carried-over characters is searched, so a fence split across
+        # chunks is still found without rescanning everything received
+        pieces = []
+        received = 0
+        body_start = -1
+        tail = ""
+        
+        for chunk in stream:
+            if not chunk.text:
+                continue
+            pieces.append(chunk.text)
+            window = tail + chunk.text
+            window_start = received - len(tail)
+            received += len(chunk.text)
+            
+            if body_start < 0:
+                fence = window.find('```toml')
+                if fence < 0:
+                    tail = window[-(len('```toml') - 1):]
+                    continue
+                body_start = window_start + fence + len('```toml')
+            
+            end = window.find('```', max(0, body_start - window_start))
+            if end >= 0:
+                # Closing fence seen - stop generation early
+                close = getattr(stream, 'close', None)
+                if close:
+                    close()
+                text = ''.join(pieces)
+                return text, text[body_start:window_start + end].strip()
+            
+            tail = window[-2:]
+        
+        return ''.join(pieces), None
+
+    def _build_prompt(
+        self, 
+        entity: VhdlEntity, 
+        vhdl_content: str, 
+        readme_content: str,
+        additional_prompt: Optional[str] = None
+    ) -> str:
+        """Build the prompt for Gemini."""
+        parts = [
+            _PROMPT_HEADER,
+            readme_content,
+            self._entity_section(entity, vhdl_content),
+            _PROMPT_TASK,
+        ]
+        
+        if additional_prompt:
+            parts.append(f"\n## Additional Requirements:\n{additional_prompt}\n")
+        
+        parts.append(_PROMPT_OUTPUT_FORMAT)
+        
+        return "".join(parts)
+
+    @staticmethod
+    def _entity_section(entity: VhdlEntity, vhdl_content: str) -> str:
+        """Build the entity-specific part of the prompt."""
+        return _PROMPT_ENTITY_SECTION.format_map({
+            'vhdl_content': vhdl_content,
+            'entity_name': entity.name,
+            'generic_count': len(entity.generics),
+            'generic_names': ', '.join(g.name for g in entity.generics),
+            'port_count': len(entity.ports),
+            'port_names': ', '.join(f"{p.name}({p.direction})" for p in entity.ports),
+        })
+
+    def _parse_ai_response(self, response_text: str, entity: VhdlEntity) -> TestbenchConfig:
+        """Parse AI response and convert to TestbenchConfig."""
+        toml_content = ""
+        try:
+            # Try progressively more tolerant extractions until one parses,
+            # skipping plain prose without paying for a TOML parse
+            parse_error = ValueError("no TOML content found")
+            for toml_content in self._toml_candidates(response_text):
+                if not self._looks_like_toml(toml_content):
+                    continue
+                try:
+                    data = tomllib.loads(toml_content)
+                    break
+                except tomllib.TOMLDecodeError as e:
+                    parse_error = e
+            else:
+                raise parse_error
             
             # Convert to TestbenchConfig  
             config = TestbenchConfig.from_dict(data)
@@ -209,67 +355,72 @@ output = "value"
             print("=" * 50)
             print(toml_content)
             print("=" * 50)
-            from .config import generate_baseline_config
             return generate_baseline_config(entity)
 
-    def _extract_toml_from_response(self, response_text: str) -> str:
-        """Extract TOML content from AI response."""
-        import re
-        
-        # Try multiple patterns to find TOML content in code blocks
-        patterns = [
-            r'```toml\n?(.*?)```',   # ```toml ... ``` (more flexible)
-            r'```TOML\n?(.*?)```',   # ```TOML ... ``` 
-            r'```\n(.*?)\n?```',     # ``` ... ``` (generic code block)
-        ]
-        
-        for pattern in patterns:
-            matches = re.finditer(pattern, response_text, re.DOTALL | re.IGNORECASE)
-            for match in matches:
-                content = match.group(1).strip()
-                # Validate that it looks like TOML
-                if self._looks_like_toml(content):
-                    return content
+    def _toml_candidates(self, response_text: str) -> Iterator[str]:
+        """Yield candidate TOML documents from the response, cheapest first."""
+        # Well-behaved responses are bare TOML or a single fenced block
+        yield self._strip_code_fence(response_text)
         
-        # More aggressive TOML extraction - look for clear TOML sections
-        lines = response_text.strip().split('\n')
-        toml_lines = []
-        in_toml_section = False
-        found_toml_start = False
+        # Extract TOML content from the response
+        toml_content = self._extract_toml_from_response(response_text)
+        yield toml_content
         
-        for line in lines:
-            line_stripped = line.strip()
-            
-            # Skip empty lines before TOML starts
-            if not line_stripped and not found_toml_start:
-                continue
-                
-            # Look for clear TOML indicators
-            is_toml_line = (
-                '=' in line_stripped or 
-                line_stripped.startswith('[') or 
-                line_stripped.startswith('[[') or
-                line_stripped.startswith('#') or
-                (found_toml_start and line_stripped)  # Continue if we've started
-            )
-            
-            # Start collecting TOML content
-            if is_toml_line and not found_toml_start:
-                found_toml_start = True
-                in_toml_section = True
-                
-            if in_toml_section:
-                toml_lines.append(line)
-                
-                # Don't stop early - let _clean_trailing_text handle cleanup
+        # Retry once without trailing prose
+        yield self._clean_trailing_text(toml_content)
+
+    @staticmethod
+    def _strip_code_fence(response_text: str) -> str:
+        """Remove a code fence wrapping the whole response, if any."""
+        stripped = response_text.strip()
+        for prefix in ('```toml', '```TOML', '```'):
+            if stripped.startswith(prefix):
+                stripped = stripped[len(prefix):]
+                break
+        return stripped.removesuffix('```').strip()
+
+    def _extract_toml_from_response(self, response_text: str) -> str:
+        """Extract TOML content from AI response."""
+        # Single linear scan for a fenced code block
+        fenced = self._find_fenced_block(response_text)
+        if fenced is not None:
+            return fenced
         
-        result = '\n'.join(toml_lines) if toml_lines else response_text
+        # More aggressive TOML extraction - everything from the first line
+        # with a clear TOML indicator on; let _clean_trailing_text handle cleanup
+        stripped = response_text.strip()
+        start = _TOML_START_RE.search(stripped)
+        result = stripped[start.start():] if start else response_text
         
         # Final cleanup - remove trailing explanatory text
         result = self._clean_trailing_text(result)
         
         return result
     
+    def _find_fenced_block(self, response_text: str) -> Optional[str]:
+        """Return the body of the first code block that looks like TOML.
+        
+        ```toml fences are tried before bare ``` fences, so an example block
+        in another language never hides the configuration that follows it.
+        """
+        for open_fence in _FENCE_OPENERS:
+            for content in self._fenced_bodies(response_text, open_fence):
+                if self._looks_like_toml(content):
+                    return content
+        return None
+    
+    @staticmethod
+    def _fenced_bodies(response_text: str, open_fence: Callable[[str, int], int]) -> Iterator[str]:
+        """Yield the bodies of the code blocks opened by fences that open_fence finds."""
+        pos = 0
+        while (body_start := open_fence(response_text, pos)) >= 0:
+            end = response_text.find('```', body_start)
+            if end < 0:
+                return
+            yield response_text[body_start:end].strip()
+            # A closing fence may open the next block if a ```lang fence was missed
+            pos = end
+    
     def _clean_trailing_text(self, toml_content: str) -> str:
         """Clean trailing explanatory text from TOML content."""
         lines = toml_content.split('\n')
@@ -284,12 +435,9 @@ output = "value"
                 clean_lines.append(line)
                 continue
                 
-            # Keep TOML structure elements
-            if (line_stripped.startswith('#') or          # Comments
-                '=' in line_stripped or                   # Key-value pairs
-                line_stripped.startswith('[') or          # Sections
-                line_stripped.startswith('description') or # Description fields
-                line_stripped.startswith('time_ns')):     # Time fields
+            # Keep TOML structure elements: key-value pairs, comments,
+            # sections, description and time fields
+            if '=' in line_stripped or line_stripped.startswith(_TOML_LINE_PREFIXES):
                 clean_lines.append(line)
             else:
                 # Check if this looks like TOML data within a section
@@ -305,16 +453,174 @@ output = "value"
 
     def _looks_like_toml(self, content: str) -> bool:
         """Check if content looks like valid TOML."""
-        # Basic heuristics to validate TOML-like content
-        lines = [line.strip() for line in content.split('\n') if line.strip()]
-        if not lines:
-            return False
-        
         # Should have at least some key-value pairs or sections
-        has_keyvalue = any('=' in line and not line.startswith('#') for line in lines)
-        has_sections = any(line.startswith('[') and line.endswith(']') for line in lines)
+        return _TOML_LINE_RE.search(content) is not None
+
+
+def _exact_toml_fence(text: str, pos: int) -> int:
+    """Body start of the next lowercase ```toml fence, or -1."""
+    start = text.find('```toml', pos)
+    return start + len('```toml') if start >= 0 else -1
+
+
+def _any_case_toml_fence(text: str, pos: int) -> int:
+    """Body start of the next ```toml fence in any case, or -1."""
+    # Slice with the match offsets; lower() can change the text's length
+    fence = _TOML_FENCE_RE.search(text, pos)
+    return fence.end() if fence else -1
+
+
+def _bare_fence(text: str, pos: int) -> int:
+    """Body start of the next generic ``` fence, which must end its line, or -1."""
+    start = text.find('```\n', pos)
+    return start + len('```\n') if start >= 0 else -1
+
+
+# Fence finders in the order _find_fenced_block tries them
+_FENCE_OPENERS = (_exact_toml_fence, _any_case_toml_fence, _bare_fence)
+
+def _is_transient_error(error: Exception) -> bool:
+    """Check if a Gemini API error is worth retrying."""
+    if isinstance(error, genai_errors.ServerError):
+        return True
+    return (
+        isinstance(error, genai_errors.ClientError) and
+        error.code in _RETRYABLE_CLIENT_ERROR_CODES
+    )
+
+
+def _retry_delay(attempt: int) -> float:
+    """Jittered exponential backoff in seconds, capped at 8."""
+    return min(2 ** attempt + random.random(), 8)
+
+
+class AsyncAIConfigGenerator(AIConfigGenerator):
+    """AI config generator that issues several requests concurrently."""
+
+    def __init__(
+        self,
+        project_id: Optional[str] = None,
+        location: Optional[str] = None,
+        max_concurrent_requests: int = 5,
+        max_retries: int = 2
+    ):
+        """Initialize async AI config generator."""
+        super().__init__(project_id=project_id, location=location, max_retries=max_retries)
+        self.semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+    async def agenerate_config(
+        self,
+        vhdl_file: Path,
+        additional_prompt: Optional[str] = None,
+        verbose: bool = False,
+        source: Optional[Tuple[str, VhdlEntity]] = None
+    ) -> TestbenchConfig:
+        """Generate intelligent configuration using the async Gemini API.
+        
+        Pass source as the (vhdl_content, entity) pair from
+        VhdlParser.parse_file_with_source to skip parsing vhdl_file again.
+        """
+        if source is None:
+            if verbose:
+                print(f"Parsing VHDL file: {vhdl_file}")
+            
+            # Keep file I/O off the event loop so other requests keep progressing
+            source = await asyncio.to_thread(VhdlParser.parse_file_with_source, vhdl_file)
+        vhdl_content, entity = source
+        
+        readme_content = await asyncio.to_thread(getattr, self, '_readme')
+        
+        prompt = self._build_prompt(entity, vhdl_content, readme_content, additional_prompt)
         
-        return has_keyvalue or has_sections
+        try:
+            async with self.semaphore:
+                if verbose:
+                    print(f"Generating AI-powered configuration for {vhdl_file}...")
+                response = await self._acall_with_retries(
+                    lambda: self.client.aio.models.generate_content(
+                        model='gemini-2.5-pro',
+                        contents=prompt
+                    )
+                )
+            
+            return self._parse_ai_response(response.text, entity)
+            
+        except Exception as e:
+            raise RuntimeError(f"Failed to generate AI configuration for '{vhdl_file}': {e}")
+
+
+def generate_ai_configs(
+    vhdl_files: List[Path],
+    additional_prompt: Optional[str] = None,
+    project_id: Optional[str] = None,
+    location: Optional[str] = None,
+    max_concurrent_requests: int = 5,
+    verbose: bool = False
+) -> List[Tuple[Optional[Path], Optional[str]]]:
+    """Generate AI-powered configurations for several files concurrently.
+    
+    Each config is saved to <entity_name>_ai_config.toml as soon as its
+    request finishes. Returns one (output_path, None) or (None, error message)
+    pair per file, in input order, so one failed file never discards the rest.
+    Raises ValueError before any request if two files would share an output.
+    """
+    
+    # Output names come from the entity names, so every file is parsed (once)
+    # and checked before spending requests
+    parsed = []
+    for vhdl_file in vhdl_files:
+        if verbose:
+            print(f"Parsing VHDL file: {vhdl_file}")
+        try:
+            parsed.append((VhdlParser.parse_file_with_source(vhdl_file), None))
+        except Exception as e:
+            parsed.append((None, str(e)))
+    
+    claimed = {}
+    for vhdl_file, (source, _) in zip(vhdl_files, parsed):
+        if source is None:
+            continue
+        entity = source[1]
+        output_path = Path(f"{entity.name}_ai_config.toml")
+        if output_path in claimed:
+            raise ValueError(
+                f"'{claimed[output_path]}' and '{vhdl_file}' both define entity "
+                f"'{entity.name}' and would be saved to '{output_path}'"
+            )
+        claimed[output_path] = vhdl_file
+    
+    generator = AsyncAIConfigGenerator(
+        project_id=project_id,
+        location=location,
+        max_concurrent_requests=max_concurrent_requests
+    )
+    
+    async def _generate_one(vhdl_file: Path, source: Optional[Tuple[str, VhdlEntity]], error: Optional[str]) -> Path:
+        if source is None:
+            raise RuntimeError(error)
+        entity = source[1]
+        config = await generator.agenerate_config(vhdl_file, additional_prompt, verbose, source=source)
+        output_path = Path(f"{entity.name}_ai_config.toml")
+        await asyncio.to_thread(save_config, config, output_path)
+        return output_path
+    
+    async def _generate_all() -> list:
+        return await asyncio.gather(
+            *(_generate_one(vhdl_file, source, error)
+              for vhdl_file, (source, error) in zip(vhdl_files, parsed)),
+            return_exceptions=True
+        )
+    
+    results = []
+    for outcome in asyncio.run(_generate_all()):
+        if isinstance(outcome, Exception):
+            results.append((None, str(outcome)))
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            results.append((outcome, None))
+    
+    return results
 
 
 def generate_ai_config(
@@ -330,10 +636,9 @@ def generate_ai_config(
     generator = AIConfigGenerator(project_id=project_id, location=location)
     config = generator.generate_config(vhdl_file, additional_prompt, verbose)
     
-    # Determine output path
+    # Determine output path from the entity already parsed by the generator
     if not output_path:
-        entity = VhdlParser.parse_file(vhdl_file)
-        output_path = Path(f"{entity.name}_ai_config.toml")
+        output_path = Path(f"{generator.last_entity.name}_ai_config.toml")
     
     # Save configuration
     save_config(config, output_path)
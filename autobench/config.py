@@ -2,7 +2,7 @@
 
 import tomllib
 import tomli_w
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Dict, List, Optional
 from pathlib import Path
 
@@ -18,6 +18,17 @@ class TestVector:
     description: Optional[str] = None
 
 
+def _vector_to_dict(vector: TestVector) -> dict:
+    """Serialize a test vector, dropping empty optional fields."""
+    # Signal maps hold plain values, so shallow copies keep the result independent
+    result = {'time_ns': vector.time_ns, 'inputs': dict(vector.inputs)}
+    if vector.expected_outputs:
+        result['expected_outputs'] = dict(vector.expected_outputs)
+    if vector.description:
+        result['description'] = vector.description
+    return result
+
+
 @dataclass
 class TestbenchConfig:
     """Configuration for testbench generation."""
@@ -28,27 +39,18 @@ class TestbenchConfig:
 
     def to_dict(self) -> dict:
         """Convert to dictionary for TOML serialization."""
+        # Built field by field rather than with asdict, which deep-copies
+        # every vector before its empty fields are filtered out again
         result = {}
-        
         if self.clock_period_ns is not None:
             result['clock_period_ns'] = self.clock_period_ns
         if self.reset_duration_ns is not None:
             result['reset_duration_ns'] = self.reset_duration_ns
-        if self.generics is not None:
-            result['generics'] = self.generics
-        
         if self.test_vectors:
-            result['test_vectors'] = []
-            for vector in self.test_vectors:
-                vector_dict = {
-                    'time_ns': vector.time_ns,
-                    'inputs': vector.inputs
-                }
-                if vector.expected_outputs:
-                    vector_dict['expected_outputs'] = vector.expected_outputs
-                if vector.description:
-                    vector_dict['description'] = vector.description
-                result['test_vectors'].append(vector_dict)
+            # Inputs are always kept (possibly empty); other vector fields only when set
+            result['test_vectors'] = [_vector_to_dict(vector) for vector in self.test_vectors]
+        if self.generics is not None:
+            result['generics'] = dict(self.generics)
         
         return result
 
@@ -77,8 +79,7 @@ class TestbenchConfig:
 def load_config(path: Path) -> TestbenchConfig:
     """Load configuration from TOML file."""
     try:
-        with open(path, 'rb') as f:
-            data = tomllib.load(f)
+        data = tomllib.loads(path.read_text(encoding='utf-8'))
         return TestbenchConfig.from_dict(data)
     except FileNotFoundError:
         raise FileNotFoundError(f"Failed to read config file '{path}': File not found")
@@ -89,8 +90,7 @@ def load_config(path: Path) -> TestbenchConfig:
 def save_config(config: TestbenchConfig, path: Path) -> None:
     """Save configuration to TOML file."""
     try:
-        with open(path, 'wb') as f:
-            tomli_w.dump(config.to_dict(), f)
+        path.write_bytes(tomli_w.dumps(config.to_dict()).encode('utf-8'))
     except Exception as e:
         raise RuntimeError(f"Failed to write config file '{path}': {e}")
 
@@ -1,12 +1,77 @@
 """GHDL simulation runner for VHDL testbenches."""
 
+import functools
+import os
+import shutil
 import subprocess
 import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Iterable, List, Literal, Optional, Sequence, Tuple
 from dataclasses import dataclass
 
 
+# GHDL assertion format: "filename:line:col:@time:(assertion): message"
+_ASSERTION_RE = re.compile(r'(.+?):(\d+):(\d+):@(\d+\w+):\((\w+)\): (.+)')
+
+# Bare assertion lines without location info, e.g. "assertion error: ..."
+_SIMPLE_ASSERTION_RE = re.compile(
+    r'assertion.*(?:error|failure)|(?:error|failure).*assertion',
+    re.IGNORECASE
+)
+
+# Cheap case-insensitive prefilter for lines that can only match the bare form
+_ASSERTION_WORD_RE = re.compile(r'assertion', re.IGNORECASE)
+
+# Patterns like "Test 1:", "Test_case_name:", etc.
+_TEST_NAME_RES = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'Test\s+(\d+)',
+        r'Test\s+(\w+)',
+        r'(\w+)\s+test',
+        r'Testing\s+(\w+)'
+    )
+]
+
+# Lines kept for the failure message when output is not captured
+SIMULATION_ERROR_TAIL_LINES = 20
+
+# Supported waveform formats and the ghdl -r option that writes each one
+WaveformFormat = Literal["ghw", "vcd", "fst", "none"]
+_WAVEFORM_OPTIONS = {
+    "ghw": "--wave=",
+    "vcd": "--vcd=",
+    "fst": "--fst=",
+}
+
+# Files and entity names for one simulation:
+# (entity_file, testbench_file, entity_name, testbench_name)
+SimulationUnit = Tuple[Path, Path, str, str]
+
+# Work library file written by analysis with --std=08
+_WORK_LIBRARY_FILE = "work-obj08.cf"
+
+# GHDL work library files removed by cleanup
+_WORK_LIBRARY_FILES = frozenset({
+    "work-obj08.cf",
+    "work-obj93.cf",
+    "work-obj87.cf",
+})
+
+
+@functools.lru_cache(maxsize=1)
+def _ghdl_available() -> bool:
+    """Probe for GHDL once per process by looking it up on PATH."""
+    return shutil.which("ghdl") is not None
+
+
+def reset_ghdl_probe() -> None:
+    """Forget the cached GHDL availability, e.g. after installing GHDL."""
+    _ghdl_available.cache_clear()
+
+
 @dataclass
 class TestResult:
     """Represents the result of a single test assertion."""
@@ -35,9 +100,18 @@ class GHDLRunner:
         """Initialize GHDL runner."""
         self.work_dir = work_dir or Path.cwd()
         self.work_dir.mkdir(exist_ok=True)
+        
+        # Files analyzed into the work library, in order, with their
+        # (mtime_ns, size) signatures, so repeated simulations on this runner
+        # skip files that are unchanged
+        self._analyzed_files: List[Tuple[Path, Tuple[int, int]]] = []
     
     def check_ghdl_available(self) -> bool:
         """Check if GHDL is available on the system."""
+        return _ghdl_available()
+    
+    def get_ghdl_version(self) -> Optional[str]:
+        """Return the output of `ghdl --version`, or None if it cannot be run."""
         try:
             result = subprocess.run(
                 ["ghdl", "--version"], 
@@ -45,9 +119,9 @@ class GHDLRunner:
                 text=True, 
                 timeout=10
             )
-            return result.returncode == 0
         except (subprocess.TimeoutExpired, FileNotFoundError):
-            return False
+            return None
+        return result.stdout.strip() if result.returncode == 0 else None
     
     def compile_and_simulate(
         self, 
@@ -56,9 +130,15 @@ class GHDLRunner:
         entity_name: str,
         testbench_name: str,
         generate_waveform: bool = True,
-        simulation_time: Optional[str] = None
+        simulation_time: Optional[str] = None,
+        waveform_format: WaveformFormat = "ghw",
+        capture_output: bool = True
     ) -> SimulationResult:
-        """Compile VHDL files and run simulation."""
+        """Compile VHDL files and run simulation.
+        
+        With capture_output=False, successful runs return empty output
+        strings and failures keep only a short tail for the error message.
+        """
         
         if not self.check_ghdl_available():
             return SimulationResult(
@@ -70,62 +150,67 @@ class GHDLRunner:
             )
         
         try:
-            # Step 1: Analyze (compile) the entity file
-            entity_result = self._analyze_file(entity_file)
-            if entity_result.returncode != 0:
-                return SimulationResult(
-                    success=False,
-                    compilation_output=entity_result.stderr,
-                    simulation_output="",
-                    test_results=[],
-                    errors=[f"Failed to compile entity: {entity_result.stderr}"]
-                )
-            
-            # Step 2: Analyze (compile) the testbench file  
-            tb_result = self._analyze_file(testbench_file)
-            if tb_result.returncode != 0:
+            # Step 1: Analyze (compile) the entity and testbench in a single
+            # GHDL run so only one process startup is paid for both files;
+            # files unchanged since a previous run on this runner are skipped
+            analyze_result = self._analyze_changed_files(
+                [entity_file] if entity_file == testbench_file else [entity_file, testbench_file]
+            )
+            if analyze_result.returncode != 0:
+                # GHDL stops at the first file with errors; messages are prefixed with its path
+                failed = "entity"
+                if entity_file != testbench_file and str(entity_file) not in analyze_result.stderr:
+                    failed = "testbench"
                 return SimulationResult(
                     success=False,
-                    compilation_output=f"{entity_result.stderr}\n{tb_result.stderr}",
+                    compilation_output=analyze_result.stderr,
                     simulation_output="",
                     test_results=[],
-                    errors=[f"Failed to compile testbench: {tb_result.stderr}"]
+                    errors=[f"Failed to compile {failed}: {analyze_result.stderr}"]
                 )
             
-            # Step 3: Elaborate (link) the testbench
+            # Step 2: Elaborate (link) the testbench
             elab_result = self._elaborate(testbench_name)
             if elab_result.returncode != 0:
                 return SimulationResult(
                     success=False,
-                    compilation_output=f"{entity_result.stderr}\n{tb_result.stderr}\n{elab_result.stderr}",
+                    compilation_output=f"{analyze_result.stderr}\n{elab_result.stderr}",
                     simulation_output="",
                     test_results=[],
                     errors=[f"Failed to elaborate: {elab_result.stderr}"]
                 )
             
-            # Step 4: Run simulation
-            sim_result = self._run_simulation(
+            # Step 3: Run simulation, parsing test results as output arrives
+            if not generate_waveform:
+                waveform_format = "none"
+            sim_process = self._run_simulation(
                 testbench_name, 
-                generate_waveform, 
-                simulation_time
+                simulation_time=simulation_time,
+                waveform_format=waveform_format
             )
+            test_results, simulation_output = self._stream_simulation_output(
+                sim_process,
+                None if capture_output else SIMULATION_ERROR_TAIL_LINES
+            )
+            returncode = sim_process.wait()
             
-            # Parse simulation output for test results
-            test_results = self._parse_test_results(sim_result.stdout + sim_result.stderr)
+            compilation_output = f"{analyze_result.stderr}\n{elab_result.stderr}"
+            if returncode == 0 and not capture_output:
+                compilation_output = simulation_output = ""
             
             waveform_file = None
-            if generate_waveform:
-                waveform_file = self.work_dir / f"{testbench_name}.ghw"
+            if waveform_format != "none":
+                waveform_file = self.work_dir / f"{testbench_name}.{waveform_format}"
                 if not waveform_file.exists():
                     waveform_file = None
             
             return SimulationResult(
-                success=sim_result.returncode == 0,
-                compilation_output=f"{entity_result.stderr}\n{tb_result.stderr}\n{elab_result.stderr}",
-                simulation_output=sim_result.stdout + sim_result.stderr,
+                success=returncode == 0,
+                compilation_output=compilation_output,
+                simulation_output=simulation_output,
                 test_results=test_results,
                 waveform_file=waveform_file,
-                errors=[] if sim_result.returncode == 0 else [sim_result.stderr]
+                errors=[] if returncode == 0 else [simulation_output]
             )
             
         except Exception as e:
@@ -137,10 +222,48 @@ class GHDLRunner:
                 errors=[f"Simulation failed: {e}"]
             )
     
-    def _analyze_file(self, vhdl_file: Path) -> subprocess.CompletedProcess:
-        """Analyze (compile) a VHDL file with GHDL."""
+    def prewarm(self, entity_file: Path) -> bool:
+        """Analyze the entity ahead of time so later simulations can reuse it."""
+        return self._analyze_changed_files([entity_file]).returncode == 0
+    
+    def _analyze_changed_files(self, vhdl_files: List[Path]) -> subprocess.CompletedProcess:
+        """Analyze the files that changed since this runner last analyzed them."""
+        if not (self.work_dir / _WORK_LIBRARY_FILE).exists():
+            self._analyzed_files.clear()
+        
+        signatures = [(vhdl_file, _file_signature(vhdl_file)) for vhdl_file in vhdl_files]
+        previous = self._analyzed_files
+        
+        # The library only matches this run if it starts with exactly the
+        # files analyzed before; another file set may define the same units
+        if [vhdl_file for vhdl_file, _ in previous] != vhdl_files[:len(previous)]:
+            start = 0
+        else:
+            # Re-analyzing a file also refreshes every file that follows it
+            start = next(
+                (i for i, (entry, current) in enumerate(zip(previous, signatures))
+                 if current[1] is None or entry != current),
+                len(previous)
+            )
+        
+        stale = vhdl_files[start:]
+        if not stale:
+            return subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr="")
+        
+        result = self._analyze_files(stale)
+        if result.returncode == 0:
+            # Unreadable files are never trusted as unchanged
+            readable = next((i for i, (_, signature) in enumerate(signatures) if signature is None), len(signatures))
+            self._analyzed_files = signatures[:readable]
+        else:
+            self._analyzed_files = signatures[:start]
+        
+        return result
+    
+    def _analyze_files(self, vhdl_files: List[Path]) -> subprocess.CompletedProcess:
+        """Analyze (compile) VHDL files, in order, with one GHDL invocation."""
         return subprocess.run(
-            ["ghdl", "-a", "--std=08", str(vhdl_file)],
+            ["ghdl", "-a", "--std=08", *(str(f) for f in vhdl_files)],
             cwd=self.work_dir,
             capture_output=True,
             text=True
@@ -158,15 +281,18 @@ class GHDLRunner:
     def _run_simulation(
         self, 
         entity_name: str, 
-        generate_waveform: bool = True,
-        simulation_time: Optional[str] = None
-    ) -> subprocess.CompletedProcess:
-        """Run the simulation with GHDL."""
-        cmd = ["ghdl", "-r", "--std=08", entity_name]
+        simulation_time: Optional[str] = None,
+        waveform_format: WaveformFormat = "ghw"
+    ) -> subprocess.Popen:
+        """Start the simulation with GHDL, merging stderr into stdout."""
+        # Skip the spurious IEEE library warnings emitted at 0 ns
+        cmd = ["ghdl", "-r", "--std=08", entity_name, "--ieee-asserts=disable-at-0"]
         
-        if generate_waveform:
-            waveform_file = self.work_dir / f"{entity_name}.ghw"
-            cmd.extend(["--wave=" + str(waveform_file)])
+        if waveform_format != "none":
+            if waveform_format not in _WAVEFORM_OPTIONS:
+                raise ValueError(f"Unsupported waveform format: {waveform_format}")
+            waveform_file = self.work_dir / f"{entity_name}.{waveform_format}"
+            cmd.extend([_WAVEFORM_OPTIONS[waveform_format] + str(waveform_file)])
         
         if simulation_time:
             cmd.extend([f"--stop-time={simulation_time}"])
@@ -174,28 +300,55 @@ class GHDLRunner:
             # Default to reasonable simulation time
             cmd.extend(["--stop-time=10us"])
         
-        return subprocess.run(
+        return subprocess.Popen(
             cmd,
             cwd=self.work_dir,
-            capture_output=True,
-            text=True
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
         )
     
+    def _stream_simulation_output(
+        self,
+        process: subprocess.Popen,
+        tail_lines: Optional[int] = None
+    ) -> Tuple[List[TestResult], str]:
+        """Parse simulation output line by line.
+        
+        The full output is kept unless tail_lines bounds it to the last lines.
+        """
+        tail = deque(maxlen=tail_lines)
+        
+        def lines() -> Iterable[str]:
+            for line in process.stdout:
+                tail.append(line)
+                yield line
+        
+        try:
+            test_results = self._parse_test_lines(lines())
+        except BaseException:
+            process.kill()
+            raise
+        return test_results, "".join(tail)
+    
     def _parse_test_results(self, output: str) -> List[TestResult]:
         """Parse GHDL output to extract test results from assertions."""
+        return self._parse_test_lines(output.split('\n'))
+    
+    def _parse_test_lines(self, lines: Iterable[str]) -> List[TestResult]:
+        """Extract test results from an iterable of GHDL output lines."""
         test_results = []
         
-        # Look for assertion messages
-        # GHDL assertion format: "filename:line:col:@time:(assertion): message"
-        assertion_pattern = r'(.+?):(\d+):(\d+):@(\d+\w+):\((\w+)\): (.+)'
-        
-        for line in output.split('\n'):
-            line = line.strip()
-            if not line:
+        for line in lines:
+            # Cheap prefilter without lowercasing: only lines with a location tag
+            # or the word "assertion" can match either pattern below
+            if ':@' not in line and not _ASSERTION_WORD_RE.search(line):
                 continue
+            line = line.strip()
                 
             # Look for assertion failures
-            match = re.search(assertion_pattern, line)
+            match = _ASSERTION_RE.search(line)
             if match:
                 filename, line_num, col, time, severity, message = match.groups()
                 
@@ -214,7 +367,7 @@ class GHDLRunner:
                 ))
             
             # Also look for simple assertion messages without full location info
-            elif "assertion" in line.lower() and ("error" in line.lower() or "failure" in line.lower()):
+            elif _SIMPLE_ASSERTION_RE.search(line):
                 test_name = self._extract_test_name(line)
                 test_results.append(TestResult(
                     test_name=test_name,
@@ -227,16 +380,8 @@ class GHDLRunner:
     
     def _extract_test_name(self, message: str) -> str:
         """Extract test name from assertion message."""
-        # Look for patterns like "Test 1:", "Test_case_name:", etc.
-        test_patterns = [
-            r'Test\s+(\d+)',
-            r'Test\s+(\w+)',
-            r'(\w+)\s+test',
-            r'Testing\s+(\w+)'
-        ]
-        
-        for pattern in test_patterns:
-            match = re.search(pattern, message, re.IGNORECASE)
+        for pattern in _TEST_NAME_RES:
+            match = pattern.search(message)
             if match:
                 return f"Test {match.group(1)}"
         
@@ -248,32 +393,54 @@ class GHDLRunner:
         """Determine if an assertion represents a passing or failing test."""
         # Most assertions in VHDL represent failures
         # But some might be informational
-        message_lower = message.lower()
-        
-        if severity.lower() in ["note", "info"]:
+        if severity.lower() in ("note", "info"):
             return True
         
-        if any(word in message_lower for word in ["pass", "success", "ok", "correct"]):
-            return True
-            
-        return False  # Default to failure for error/warning/assertion severities
+        # Spelled out rather than any() over a word list, so no generator
+        # is created per assertion line
+        message_lower = message.lower()
+        return (
+            "pass" in message_lower or
+            "success" in message_lower or
+            "ok" in message_lower or
+            "correct" in message_lower
+        )  # Default to failure for error/warning/assertion severities
     
     def cleanup_work_files(self) -> None:
         """Clean up GHDL work files."""
-        work_files = [
-            "work-obj08.cf",
-            "work-obj93.cf", 
-            "work-obj87.cf",
-            "e~*.o",
-            "*.exe"  # Windows executables
-        ]
+        self._analyzed_files.clear()
+        
+        try:
+            entries = os.scandir(self.work_dir)
+        except OSError:
+            return
         
-        for pattern in work_files:
-            for file in self.work_dir.glob(pattern):
-                try:
-                    file.unlink()
-                except OSError:
-                    pass  # Ignore errors
+        with entries:
+            for entry in entries:
+                if _is_work_file(entry.name):
+                    try:
+                        os.unlink(entry.path)
+                    except OSError:
+                        pass  # Ignore errors
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """Return a file's (mtime_ns, size), or None if it cannot be read."""
+    # The size catches rewrites within one tick of a coarse-mtime filesystem
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _is_work_file(name: str) -> bool:
+    """Check if a file name matches one of the GHDL work file patterns."""
+    return (
+        name in _WORK_LIBRARY_FILES or
+        name.endswith(".exe") or  # Windows executables
+        (name.startswith("e~") and name.endswith(".o"))
+    )
 
 
 def run_ghdl_simulation(
@@ -284,7 +451,9 @@ def run_ghdl_simulation(
     work_dir: Optional[Path] = None,
     generate_waveform: bool = True,
     simulation_time: Optional[str] = None,
-    cleanup: bool = True
+    cleanup: bool = True,
+    waveform_format: WaveformFormat = "ghw",
+    capture_output: bool = True
 ) -> SimulationResult:
     """Convenience function to run GHDL simulation."""
     
@@ -297,7 +466,9 @@ def run_ghdl_simulation(
             entity_name=entity_name,
             testbench_name=testbench_name,
             generate_waveform=generate_waveform,
-            simulation_time=simulation_time
+            simulation_time=simulation_time,
+            waveform_format=waveform_format,
+            capture_output=capture_output
         )
         
         return result
@@ -305,3 +476,46 @@ def run_ghdl_simulation(
     finally:
         if cleanup:
             runner.cleanup_work_files()
+
+
+def run_ghdl_simulations(
+    units: Sequence[SimulationUnit],
+    work_dir: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+    generate_waveform: bool = True,
+    simulation_time: Optional[str] = None,
+    cleanup: bool = True,
+    waveform_format: WaveformFormat = "ghw",
+    capture_output: bool = True
+) -> List[SimulationResult]:
+    """Run several GHDL simulations concurrently, returning results in unit order.
+    
+    GHDL keeps one work library per directory, so each unit runs in its own
+    numbered subdirectory of work_dir (unit_0, unit_1, ...), where its
+    waveform is also written.
+    """
+    base_dir = work_dir or Path.cwd()
+    
+    def run(index: int, unit: SimulationUnit) -> SimulationResult:
+        entity_file, testbench_file, entity_name, testbench_name = unit
+        # GHDL runs inside the unit directory, so relative paths must be resolved first
+        return run_ghdl_simulation(
+            entity_file=entity_file.resolve(),
+            testbench_file=testbench_file.resolve(),
+            entity_name=entity_name,
+            testbench_name=testbench_name,
+            work_dir=base_dir / f"unit_{index}",
+            generate_waveform=generate_waveform,
+            simulation_time=simulation_time,
+            cleanup=cleanup,
+            waveform_format=waveform_format,
+            capture_output=capture_output
+        )
+    
+    if len(units) <= 1:
+        return [run(index, unit) for index, unit in enumerate(units)]
+    
+    # Each simulation mostly waits on GHDL processes, so threads overlap them
+    workers = max_workers or min(len(units), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run, range(len(units)), units))
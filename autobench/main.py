@@ -1,159 +1,261 @@
 """Main CLI entry point for autobench."""
 
-import click
+import argparse
+import sys
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
-from .vhdl_parser import VhdlParser
-from .config import load_config, save_config, generate_baseline_config
-from .testbench_generator import TestbenchGenerator
-from .templates import load_template, save_vhdl_template
-from .ai_integration import generate_ai_config
-from .ghdl_runner import run_ghdl_simulation
+# Subcommand dependencies are imported lazily so that --help and
+# generate-template do not pay for the Google Cloud SDK import
 
+# Per-test result line prefixes
+_PASS_PREFIX = "  ✅ PASS: "
+_FAIL_PREFIX = "  ❌ FAIL: "
+_MESSAGE_PREFIX = "    💬 "
 
-@click.group(invoke_without_command=True)
-@click.option('-i', '--input', 'input_file', type=click.Path(exists=True, path_type=Path),
-              help='Input VHDL file to parse')
-@click.option('-o', '--output', type=click.Path(path_type=Path),
-              help='Output testbench file (default: <entity_name>_tb.vhd)')
-@click.option('-c', '--config', 'config_file', type=click.Path(exists=True, path_type=Path),
-              help='Optional TOML configuration file')
-@click.option('-t', '--template', 'template_file', type=click.Path(exists=True, path_type=Path),
-              help='Custom testbench template file')
-@click.option('-v', '--verbose', is_flag=True, help='Enable verbose output')
-@click.option('-g', '--generate-config', is_flag=True,
-              help='Generate a baseline TOML configuration file and exit')
-@click.pass_context
-def main(ctx, input_file: Optional[Path], output: Optional[Path], config_file: Optional[Path],
-         template_file: Optional[Path], verbose: bool, generate_config: bool):
-    """VHDL Testbench Generator - Generate VHDL testbenches from entity files."""
+
+@dataclass(slots=True)
+class SimulateArgs:
+    """Parsed options for the simulate subcommand."""
+    entity_file: Path
+    testbench_file: Path
+    entity_name: Optional[str] = None
+    testbench_name: Optional[str] = None
+    work_dir: Optional[Path] = None
+    no_waveform: bool = False
+    waveform_format: str = 'ghw'
+    sim_time: Optional[str] = None
+    no_cleanup: bool = False
+    verbose: bool = False
+
+    @classmethod
+    def from_namespace(cls, args: argparse.Namespace) -> 'SimulateArgs':
+        """Build from the argparse namespace in a single pass."""
+        return cls(**{f.name: getattr(args, f.name) for f in fields(cls)})
+
+
+def _existing_path(value: str) -> Path:
+    """argparse type for paths that must already exist."""
+    path = Path(value)
+    if not path.exists():
+        raise argparse.ArgumentTypeError(f"Path '{value}' does not exist.")
+    return path
+
+
+def _write_lines(lines: List[str]) -> None:
+    """Write buffered output lines to stdout in one call and clear the buffer."""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        lines.clear()
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the autobench argument parser."""
+    parser = argparse.ArgumentParser(
+        prog='autobench',
+        description='VHDL Testbench Generator - Generate VHDL testbenches from entity files.'
+    )
+    parser.add_argument('-i', '--input', dest='input_file', type=_existing_path, metavar='PATH',
+                        help='Input VHDL file to parse')
+    parser.add_argument('-o', '--output', type=Path, metavar='PATH',
+                        help='Output testbench file (default: <entity_name>_tb.vhd)')
+    parser.add_argument('-c', '--config', dest='config_file', type=_existing_path, metavar='PATH',
+                        help='Optional TOML configuration file')
+    parser.add_argument('-t', '--template', dest='template_file', type=_existing_path, metavar='PATH',
+                        help='Custom testbench template file')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
+    parser.add_argument('-g', '--generate-config', action='store_true',
+                        help='Generate a baseline TOML configuration file and exit')
+    
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+    
+    template_parser = subparsers.add_parser(
+        'generate-template', help='Generate a VHDL entity template with the specified name.'
+    )
+    template_parser.add_argument('entity_name')
+    template_parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
+    template_parser.set_defaults(handler=lambda args: generate_template(args.entity_name, args.verbose))
+    
+    ai_parser = subparsers.add_parser(
+        'generate-ai-config', help='Generate intelligent testbench configuration using AI (Vertex AI).'
+    )
+    ai_parser.add_argument('vhdl_file', type=_existing_path)
+    ai_parser.add_argument('-o', '--output', type=Path, metavar='PATH',
+                           help='Output config file (default: <entity_name>_ai_config.toml)')
+    ai_parser.add_argument('-p', '--prompt', help='Additional prompt/requirements for AI')
+    ai_parser.add_argument('--project-id', help='Google Cloud project ID (or set GOOGLE_CLOUD_PROJECT env var)')
+    ai_parser.add_argument('--location', default='us-central1', help='Google Cloud location (default: us-central1)')
+    ai_parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
+    ai_parser.set_defaults(handler=lambda args: generate_ai_config_cmd(
+        args.vhdl_file, args.output, args.prompt, args.project_id, args.location, args.verbose
+    ))
+    
+    sim_parser = subparsers.add_parser('simulate', help='Run GHDL simulation of VHDL entity and testbench.')
+    sim_parser.add_argument('entity_file', type=_existing_path)
+    sim_parser.add_argument('testbench_file', type=_existing_path)
+    sim_parser.add_argument('--entity-name', help='Entity name (auto-detected if not provided)')
+    sim_parser.add_argument('--testbench-name', help='Testbench entity name (auto-detected if not provided)')
+    sim_parser.add_argument('--work-dir', type=Path, metavar='PATH', help='Working directory for GHDL files')
+    sim_parser.add_argument('--no-waveform', action='store_true', help='Skip waveform generation')
+    sim_parser.add_argument('--waveform-format', choices=['ghw', 'vcd', 'fst'], default='ghw',
+                            help='Waveform file format (default: ghw; fst is much smaller)')
+    sim_parser.add_argument('--sim-time', help='Simulation time (e.g., "1us", "100ns")')
+    sim_parser.add_argument('--no-cleanup', action='store_true', help='Keep GHDL work files after simulation')
+    sim_parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
+    sim_parser.set_defaults(handler=lambda args: simulate(SimulateArgs.from_namespace(args)))
+    
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parse command line arguments, dispatch, and return the exit code."""
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    
+    # Subcommands handle their own execution
+    if args.command is not None:
+        return args.handler(args) or 0
     
     # If no subcommand was invoked and no input file provided, show help
-    if ctx.invoked_subcommand is None and not input_file:
-        click.echo(ctx.get_help())
-        return
+    if not args.input_file:
+        parser.print_help()
+        return 0
     
-    # If a subcommand was invoked, let it handle execution
-    if ctx.invoked_subcommand is not None:
-        return
+    return generate_testbench(
+        args.input_file, args.output, args.config_file,
+        args.template_file, args.verbose, args.generate_config
+    ) or 0
+
+
+def generate_testbench(input_file: Path, output: Optional[Path], config_file: Optional[Path],
+                       template_file: Optional[Path], verbose: bool, generate_config: bool):
+    """Generate a testbench for a VHDL entity file."""
+    from .parse_cache import parse_file_memoized
+    from .config import load_config, save_config, generate_baseline_config
+    from .testbench_generator import TestbenchGenerator
+    from .templates import load_template, stream_template_to_file
+    
+    # Output lines are buffered and written in one call at the end
+    out: List[str] = []
     
     # Main generation logic
     if verbose:
-        click.echo(f"Parsing VHDL file: {input_file}")
+        out.append(f"Parsing VHDL file: {input_file}")
     
     try:
         # Parse VHDL file
-        entity = VhdlParser.parse_file(input_file)
+        entity = parse_file_memoized(input_file)
+        
+        # Paths derived from the entity name
+        default_config_path = Path(f"{entity.name}_config.toml")
+        default_tb_path = Path(f"{entity.name}_tb.vhd")
         
         if verbose:
-            click.echo(f"Parsed entity: {entity.name}")
-            click.echo(f"  Generics: {len(entity.generics)}")
-            click.echo(f"  Ports: {len(entity.ports)}")
+            out.append(f"Parsed entity: {entity.name}")
+            out.append(f"  Generics: {len(entity.generics)}")
+            out.append(f"  Ports: {len(entity.ports)}")
         
         # If generate-config flag is set, generate baseline config and exit
         if generate_config:
             baseline_config = generate_baseline_config(entity)
-            config_filename = Path(f"{entity.name}_config.toml")
+            config_filename = default_config_path
             
             save_config(baseline_config, config_filename)
             
-            click.echo(f"Generated baseline configuration file: {config_filename}")
+            out.append(f"Generated baseline configuration file: {config_filename}")
             if verbose:
-                click.echo("Edit this file to customize your test vectors and parameters,")
-                click.echo(f"then run the generator again with: -i {input_file} -c {config_filename}")
+                out.append("Edit this file to customize your test vectors and parameters,")
+                out.append(f"then run the generator again with: -i {input_file} -c {config_filename}")
             return
         
         # Load optional config
         config = None
         if config_file:
             if verbose:
-                click.echo(f"Loading config from: {config_file}")
+                out.append(f"Loading config from: {config_file}")
             config = load_config(config_file)
         else:
-            # Try to find a default config file
-            default_config = Path(f"{entity.name}_config.toml")
-            if default_config.exists():
+            # Try to load a default config file; a missing one is not an error
+            try:
+                config = load_config(default_config_path)
                 if verbose:
-                    click.echo(f"Found default config: {default_config}")
-                config = load_config(default_config)
+                    out.append(f"Found default config: {default_config_path}")
+            except FileNotFoundError:
+                pass
         
         # Generate testbench data
         testbench_data = TestbenchGenerator.generate_testbench_data(entity, config)
         
         # Load template
         if template_file and verbose:
-            click.echo(f"Loading custom template from: {template_file}")
+            out.append(f"Loading custom template from: {template_file}")
         elif verbose:
-            click.echo("Using bundled default template")
+            out.append("Using bundled default template")
         
         template = load_template(template_file)
         
-        # Generate final testbench
-        final_testbench = testbench_data.apply_to_template(template)
-        
         # Determine output file
         if not output:
-            output = Path(f"{entity.name}_tb.vhd")
+            output = default_tb_path
         
-        # Write to file
-        output.write_text(final_testbench, encoding='utf-8')
+        # Render the final testbench straight into the output file
+        try:
+            stream_template_to_file(template, testbench_data.template_fields(), output)
+        except OSError as e:
+            raise RuntimeError(f"Failed to write testbench file '{output}': {e}")
         
-        click.echo(f"Testbench generated successfully: {output}")
+        out.append(f"Testbench generated successfully: {output}")
         
         if verbose:
-            click.echo("Generated testbench contains:")
-            click.echo(f"  Component: {testbench_data.component_name}")
-            click.echo(f"  Template: {'Custom' if template_file else 'Bundled default'}")
+            out.append("Generated testbench contains:")
+            out.append(f"  Component: {testbench_data.component_name}")
+            out.append(f"  Template: {'Custom' if template_file else 'Bundled default'}")
             if config:
-                click.echo("  Config: Applied")
+                out.append("  Config: Applied")
     
     except Exception as e:
-        click.echo(f"Error: {e}", err=True)
+        _write_lines(out)
+        print(f"Error: {e}", file=sys.stderr)
         if verbose:
             raise
         return 1
+    
+    finally:
+        _write_lines(out)
 
 
-@main.command()
-@click.argument('entity_name')
-@click.option('-v', '--verbose', is_flag=True, help='Enable verbose output')
 def generate_template(entity_name: str, verbose: bool):
     """Generate a VHDL entity template with the specified name."""
+    from .templates import save_vhdl_template
+    
     template_filename = Path(f"{entity_name}.vhd")
     
     try:
         save_vhdl_template(entity_name, template_filename)
         
-        click.echo(f"Generated VHDL template file: {template_filename}")
+        print(f"Generated VHDL template file: {template_filename}")
         if verbose:
-            click.echo("Edit this file to implement your VHDL entity.")
-            click.echo(f"After implementation, generate config with: autobench -i {template_filename} -g")
+            print("Edit this file to implement your VHDL entity.")
+            print(f"After implementation, generate config with: autobench -i {template_filename} -g")
     
     except Exception as e:
-        click.echo(f"Error: {e}", err=True)
+        print(f"Error: {e}", file=sys.stderr)
         if verbose:
             raise
         return 1
 
 
-@main.command()
-@click.argument('vhdl_file', type=click.Path(exists=True, path_type=Path))
-@click.option('-o', '--output', type=click.Path(path_type=Path),
-              help='Output config file (default: <entity_name>_ai_config.toml)')
-@click.option('-p', '--prompt', help='Additional prompt/requirements for AI')
-@click.option('--project-id', help='Google Cloud project ID (or set GOOGLE_CLOUD_PROJECT env var)')
-@click.option('--location', default='us-central1', help='Google Cloud location (default: us-central1)')
-@click.option('-v', '--verbose', is_flag=True, help='Enable verbose output')
 def generate_ai_config_cmd(vhdl_file: Path, output: Optional[Path], prompt: Optional[str], 
                           project_id: Optional[str], location: str, verbose: bool):
     """Generate intelligent testbench configuration using AI (Vertex AI)."""
+    from .ai_integration import generate_ai_config
     
     try:
         if verbose:
-            click.echo(f"Using Vertex AI to generate configuration for: {vhdl_file}")
+            print(f"Using Vertex AI to generate configuration for: {vhdl_file}")
             if prompt:
-                click.echo(f"Additional requirements: {prompt}")
+                print(f"Additional requirements: {prompt}")
         
         output_path = generate_ai_config(
             vhdl_file=vhdl_file,
@@ -164,130 +266,134 @@ def generate_ai_config_cmd(vhdl_file: Path, output: Optional[Path], prompt: Opti
             verbose=verbose
         )
         
-        click.echo(f"AI-generated configuration saved to: {output_path}")
+        print(f"AI-generated configuration saved to: {output_path}")
         if verbose:
-            click.echo("Review and edit the configuration as needed, then generate testbench with:")
-            click.echo(f"autobench -i {vhdl_file} -c {output_path}")
+            print("Review and edit the configuration as needed, then generate testbench with:")
+            print(f"autobench -i {vhdl_file} -c {output_path}")
     
     except ValueError as e:
         if "project ID" in str(e):
-            click.echo("Error: Google Cloud project ID required.", err=True)
-            click.echo("Set the GOOGLE_CLOUD_PROJECT environment variable or use --project-id option.", err=True)
-            click.echo("Ensure you have authenticated with: gcloud auth application-default login", err=True)
+            print("Error: Google Cloud project ID required.", file=sys.stderr)
+            print("Set the GOOGLE_CLOUD_PROJECT environment variable or use --project-id option.", file=sys.stderr)
+            print("Ensure you have authenticated with: gcloud auth application-default login", file=sys.stderr)
         else:
-            click.echo(f"Error: {e}", err=True)
+            print(f"Error: {e}", file=sys.stderr)
         return 1
     
     except Exception as e:
-        click.echo(f"Error: {e}", err=True)
+        print(f"Error: {e}", file=sys.stderr)
         if verbose:
             raise
         return 1
 
 
-@main.command()
-@click.argument('entity_file', type=click.Path(exists=True, path_type=Path))
-@click.argument('testbench_file', type=click.Path(exists=True, path_type=Path))
-@click.option('--entity-name', help='Entity name (auto-detected if not provided)')
-@click.option('--testbench-name', help='Testbench entity name (auto-detected if not provided)')
-@click.option('--work-dir', type=click.Path(path_type=Path), help='Working directory for GHDL files')
-@click.option('--no-waveform', is_flag=True, help='Skip waveform generation (.ghw file)')
-@click.option('--sim-time', help='Simulation time (e.g., "1us", "100ns")')
-@click.option('--no-cleanup', is_flag=True, help='Keep GHDL work files after simulation')
-@click.option('-v', '--verbose', is_flag=True, help='Enable verbose output')
-def simulate(entity_file: Path, testbench_file: Path, entity_name: Optional[str], 
-            testbench_name: Optional[str], work_dir: Optional[Path], no_waveform: bool,
-            sim_time: Optional[str], no_cleanup: bool, verbose: bool):
+def simulate(options: SimulateArgs):
     """Run GHDL simulation of VHDL entity and testbench."""
+    from concurrent.futures import ThreadPoolExecutor
+    from .parse_cache import try_parse_file
+    from .ghdl_runner import run_ghdl_simulation
+    
+    verbose = options.verbose
+    entity_name = options.entity_name
+    testbench_name = options.testbench_name
     
     try:
-        # Auto-detect entity names if not provided
-        if not entity_name:
-            if verbose:
-                click.echo(f"Auto-detecting entity name from {entity_file}")
-            try:
-                entity = VhdlParser.parse_file(entity_file)
-                entity_name = entity.name
-            except Exception as e:
-                click.echo(f"Error: Could not auto-detect entity name: {e}", err=True)
+        # Auto-detect entity names if not provided; both files are parsed concurrently
+        if verbose and not entity_name:
+            print(f"Auto-detecting entity name from {options.entity_file}")
+        if verbose and not testbench_name:
+            print(f"Auto-detecting testbench name from {options.testbench_file}")
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            entity_future = None if entity_name else executor.submit(try_parse_file, options.entity_file)
+            testbench_future = None if testbench_name else executor.submit(try_parse_file, options.testbench_file)
+        
+        if entity_future:
+            entity, error = entity_future.result()
+            if error:
+                print(f"Error: Could not auto-detect entity name: {error}", file=sys.stderr)
                 return 1
+            entity_name = entity.name
         
-        if not testbench_name:
-            if verbose:
-                click.echo(f"Auto-detecting testbench name from {testbench_file}")
-            try:
-                testbench_entity = VhdlParser.parse_file(testbench_file)
-                testbench_name = testbench_entity.name
-            except Exception as e:
-                click.echo(f"Error: Could not auto-detect testbench name: {e}", err=True)
+        if testbench_future:
+            testbench_entity, error = testbench_future.result()
+            if error:
+                print(f"Error: Could not auto-detect testbench name: {error}", file=sys.stderr)
                 return 1
+            testbench_name = testbench_entity.name
         
         if verbose:
-            click.echo(f"Entity: {entity_name}")
-            click.echo(f"Testbench: {testbench_name}")
-            click.echo(f"Generating waveform: {not no_waveform}")
-            if sim_time:
-                click.echo(f"Simulation time: {sim_time}")
+            print(f"Entity: {entity_name}")
+            print(f"Testbench: {testbench_name}")
+            print(f"Generating waveform: {not options.no_waveform}")
+            if not options.no_waveform:
+                print(f"Waveform format: {options.waveform_format}")
+            if options.sim_time:
+                print(f"Simulation time: {options.sim_time}")
         
         # Run simulation
         result = run_ghdl_simulation(
-            entity_file=entity_file,
-            testbench_file=testbench_file,
+            entity_file=options.entity_file,
+            testbench_file=options.testbench_file,
             entity_name=entity_name,
             testbench_name=testbench_name,
-            work_dir=work_dir,
-            generate_waveform=not no_waveform,
-            simulation_time=sim_time,
-            cleanup=not no_cleanup
+            work_dir=options.work_dir,
+            generate_waveform=not options.no_waveform,
+            simulation_time=options.sim_time,
+            cleanup=not options.no_cleanup,
+            waveform_format=options.waveform_format,
+            capture_output=verbose
         )
         
         # Report results
         if result.success:
-            click.echo(f"✅ Simulation completed successfully")
+            out: List[str] = []
+            out.append(f"✅ Simulation completed successfully")
             
             # Show test results
             if result.test_results:
-                passed_tests = sum(1 for t in result.test_results if t.passed)
+                passed_tests = sum(t.passed for t in result.test_results)
                 total_tests = len(result.test_results)
                 
-                click.echo(f"\n📊 Test Results: {passed_tests}/{total_tests} passed")
+                out.append(f"\n📊 Test Results: {passed_tests}/{total_tests} passed")
                 
                 for test in result.test_results:
-                    status = "✅ PASS" if test.passed else "❌ FAIL"
-                    time_info = f" @{test.time}" if test.time else ""
-                    click.echo(f"  {status}: {test.test_name}{time_info}")
+                    line = (_PASS_PREFIX if test.passed else _FAIL_PREFIX) + test.test_name
+                    out.append(line + " @" + test.time if test.time else line)
                     if not test.passed and verbose:
-                        click.echo(f"    💬 {test.message}")
+                        out.append(_MESSAGE_PREFIX + test.message)
                 
                 if passed_tests < total_tests:
-                    click.echo(f"\n❌ {total_tests - passed_tests} test(s) failed")
+                    out.append(f"\n❌ {total_tests - passed_tests} test(s) failed")
             
             # Show waveform info
             if result.waveform_file:
-                click.echo(f"\n🌊 Waveform saved: {result.waveform_file}")
-                click.echo(f"   Open with: gtkwave {result.waveform_file}")
+                out.append(f"\n🌊 Waveform saved: {result.waveform_file}")
+                out.append(f"   Open with: gtkwave {result.waveform_file}")
+            
+            _write_lines(out)
             
         else:
-            click.echo("❌ Simulation failed", err=True)
+            print("❌ Simulation failed", file=sys.stderr)
             
             if result.errors:
                 for error in result.errors:
-                    click.echo(f"Error: {error}", err=True)
+                    print(f"Error: {error}", file=sys.stderr)
             
             if verbose and result.compilation_output:
-                click.echo(f"\nCompilation output:\n{result.compilation_output}")
+                print(f"\nCompilation output:\n{result.compilation_output}")
             
             if verbose and result.simulation_output:
-                click.echo(f"\nSimulation output:\n{result.simulation_output}")
+                print(f"\nSimulation output:\n{result.simulation_output}")
             
             return 1
     
     except Exception as e:
-        click.echo(f"Error: {e}", err=True)
+        print(f"Error: {e}", file=sys.stderr)
         if verbose:
             raise
         return 1
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""On-disk cache of parsed VHDL entities, keyed by file content."""
+
+import functools
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .vhdl_parser import VhdlParser, VhdlEntity
+
+# Bump when VhdlEntity or the parser output changes shape
+_CACHE_VERSION = b"5"
+
+CACHE_DIR = Path(tempfile.gettempdir()) / "autobench-cache"
+
+
+def parse_file_cached(path: Path) -> VhdlEntity:
+    """Parse a VHDL file, reusing a cached entity when the content is unchanged."""
+    if os.getenv("AUTOBENCH_NO_CACHE") == "1":
+        return VhdlParser.parse_file(path)
+
+    try:
+        data = path.read_bytes()
+    except OSError:
+        # Let the parser report the error consistently
+        return VhdlParser.parse_file(path)
+
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return _parse_bytes(path, data)
+
+    key = hashlib.blake2b(_CACHE_VERSION + data, digest_size=16).hexdigest()
+    cache_file = cache_dir / f"{key}.pkl"
+
+    try:
+        entity = pickle.loads(cache_file.read_bytes())
+        if isinstance(entity, VhdlEntity):
+            return entity
+    except Exception:
+        pass
+
+    entity = _parse_bytes(path, data)
+    _store(cache_file, entity)
+    return entity
+
+
+def parse_file_memoized(path: Path) -> VhdlEntity:
+    """Parse a VHDL file at most once per process while it is unchanged."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return parse_file_cached(path)
+    return _parse_memo(path, stat.st_mtime_ns, stat.st_size)
+
+
+def try_parse_file(path: Path) -> Tuple[Optional[VhdlEntity], Optional[str]]:
+    """Memoized parse that returns (entity, None) or (None, error message)."""
+    try:
+        return parse_file_memoized(path), None
+    except Exception as e:
+        return None, str(e)
+
+
+@functools.lru_cache(maxsize=16)
+def _parse_memo(path: Path, mtime_ns: int, size: int) -> VhdlEntity:
+    """Memoized parse keyed by path and stat signature."""
+    return parse_file_cached(path)
+
+
+def _parse_bytes(path: Path, data: bytes) -> VhdlEntity:
+    """Parse already-read file bytes with the parser's error wrapping."""
+    try:
+        return VhdlParser.parse_content(data.decode('utf-8'))
+    except Exception as e:
+        raise RuntimeError(f"Failed to parse VHDL file '{path}': {e}")
+
+
+def _cache_dir() -> Optional[Path]:
+    """Return the cache directory, or None if it cannot be used safely."""
+    try:
+        CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # Never unpickle from a directory another user controls
+        if hasattr(os, "getuid") and CACHE_DIR.stat().st_uid != os.getuid():
+            return None
+    except OSError:
+        return None
+    return CACHE_DIR
+
+
+def _store(cache_file: Path, entity: VhdlEntity) -> None:
+    """Atomically write a cache entry; failures only cost a later re-parse."""
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(pickle.dumps(entity, protocol=pickle.HIGHEST_PROTOCOL))
+            os.replace(tmp_name, cache_file)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    except OSError:
+        pass
@@ -1,7 +1,12 @@
 """Template handling for VHDL generation."""
 
+import functools
+import keyword
+import os
+import unicodedata
 from pathlib import Path
-from typing import Optional
+from string import Formatter
+from typing import Callable, List, Mapping, Optional, Tuple
 
 # Default template bundled into the module
 DEFAULT_TEMPLATE = """--=============================================================================
@@ -56,6 +61,88 @@ end process stim_proc;
 end testbench;"""
 
 
+_FORMATTER = Formatter()
+
+
+@functools.lru_cache(maxsize=16)
+def _template_plan(template: str) -> Tuple[Tuple[str, Optional[str], Optional[str], Optional[str]], ...]:
+    """Parse a format template into (literal, field, spec, conversion) tuples once."""
+    return tuple(_FORMATTER.parse(template))
+
+
+def _render_chunks(template: str, mapping: Mapping[str, str]) -> List[str]:
+    """Resolve a template into literal and substituted chunks, in order."""
+    chunks = []
+    for literal, field, spec, conversion in _template_plan(template):
+        chunks.append(literal)
+        if field is None:
+            continue
+        if not spec and conversion is None and field in mapping:
+            chunks.append(str(mapping[field]))
+        else:
+            # Full str.format semantics: attribute/index lookups, conversions, nested specs
+            value, _ = _FORMATTER.get_field(field, (), mapping)
+            value = _FORMATTER.convert_field(value, conversion)
+            if spec and '{' in spec:
+                spec = _FORMATTER.vformat(spec, (), mapping)
+            chunks.append(_FORMATTER.format_field(value, spec))
+    return chunks
+
+
+@functools.lru_cache(maxsize=16)
+def _template_emitter(template: str) -> Optional[Callable[..., str]]:
+    """Compile a template into a function returning a single f-string.
+    
+    Only templates whose fields are plain identifiers qualify; anything
+    using conversions, format specs or lookups returns None.
+    """
+    pieces = []
+    fields = []
+    for literal, field, spec, conversion in _template_plan(template):
+        if literal:
+            pieces.append('f' + repr(literal.replace('{', '{{').replace('}', '}}')))
+        if field is None:
+            continue
+        # Python NFKC-normalizes identifiers, so '{ﬁeld}' would bind 'field'
+        if (spec or conversion is not None or not field.isidentifier() or
+                keyword.iskeyword(field) or field == '_extra_fields' or
+                unicodedata.normalize('NFKC', field) != field):
+            return None
+        pieces.append(f"f'{{{field}}}'")
+        if field not in fields:
+            fields.append(field)
+    
+    params = ''.join(f'{field}, ' for field in fields)
+    source = f"def _emit({params}**_extra_fields):\n    return {' '.join(pieces) or repr('')}\n"
+    namespace = {}
+    try:
+        exec(compile(source, '<template>', 'exec'), namespace)
+    except SyntaxError:
+        # Anything the emitter cannot express is left to the field plan
+        return None
+    return namespace['_emit']
+
+
+def render(template: str, mapping: Mapping[str, str]) -> str:
+    """Render a format template using its compiled emitter or cached field plan."""
+    emitter = _template_emitter(template)
+    if emitter is not None:
+        try:
+            return emitter(**mapping)
+        except TypeError:
+            # Missing fields; the plan path raises the same KeyError as str.format
+            pass
+    return ''.join(_render_chunks(template, mapping))
+
+
+def stream_template_to_file(template: str, mapping: Mapping[str, str], path: Path) -> None:
+    """Render a template straight into a file without joining the output."""
+    # Resolve every field first so a bad template never leaves a partial file
+    chunks = _render_chunks(template, mapping)
+    with open(path, 'w', encoding='utf-8', buffering=1 << 17) as f:
+        f.writelines(chunks)
+
+
 def generate_vhdl_template(entity_name: str) -> str:
     """Generate a VHDL entity template."""
     return f"""-- =============================================================================
@@ -129,20 +216,66 @@ end architecture RTL;
 """
 
 
+def _write_bytes(path: Path, data: bytes) -> None:
+    """Write pre-encoded bytes with as few os.write calls as possible."""
+    data = memoryview(data)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        # os.write may be partial for very large buffers
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+
+# Entity template pre-encoded once; only the entity name varies
+_ENTITY_PLACEHOLDER = "__ENTITY__"
+_VHDL_TEMPLATE_BYTES = generate_vhdl_template(_ENTITY_PLACEHOLDER).encode('utf-8')
+
+
 def save_vhdl_template(entity_name: str, path: Path) -> None:
     """Save VHDL template to file."""
-    template_content = generate_vhdl_template(entity_name)
+    data = _VHDL_TEMPLATE_BYTES.replace(_ENTITY_PLACEHOLDER.encode('utf-8'), entity_name.encode('utf-8'))
     try:
-        path.write_text(template_content, encoding='utf-8')
+        _write_bytes(path, data)
     except Exception as e:
         raise RuntimeError(f"Failed to write VHDL template file '{path}': {e}")
 
 
+@functools.lru_cache(maxsize=32)
+def _load_template_cached(path_str: str, mtime_ns: int) -> str:
+    """Read a template file; keyed by mtime so edits are picked up."""
+    return _read_text_noatime(path_str)
+
+
+def _read_text_noatime(path_str: str) -> str:
+    """Read a UTF-8 text file without updating its access time where supported."""
+    noatime = getattr(os, 'O_NOATIME', 0)
+    try:
+        fd = os.open(path_str, os.O_RDONLY | noatime)
+    except PermissionError:
+        # O_NOATIME is only allowed on files we own
+        if not noatime:
+            raise
+        fd = os.open(path_str, os.O_RDONLY)
+    try:
+        chunks = []
+        size = os.fstat(fd).st_size
+        while chunk := os.read(fd, max(size, 1 << 16)):
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+    
+    # Match read_text's universal newline handling
+    text = b''.join(chunks).decode('utf-8')
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
 def load_template(template_path: Optional[Path] = None) -> str:
     """Load template from file or return default template."""
     if template_path:
         try:
-            return template_path.read_text(encoding='utf-8')
+            return _load_template_cached(str(template_path), template_path.stat().st_mtime_ns)
         except Exception as e:
             raise RuntimeError(f"Failed to read template file '{template_path}': {e}")
     else:
@@ -1,13 +1,70 @@
 """Testbench generation logic."""
 
+import functools
+import io
+import itertools
+import operator
+import re
 from dataclasses import dataclass
-from typing import List, Optional, Dict
+from typing import Callable, List, Optional, Dict, Tuple
 
 from .vhdl_parser import VhdlEntity, VhdlPort, VhdlGeneric
 from .config import TestbenchConfig
+from .templates import render
 
+# Bit range like "(7 downto 0)", used to size literal values
+_DOWNTO_RANGE_RE = re.compile(r'\((\d+)\s+downto\s+(\d+)\)')
 
-@dataclass
+# Hex letters and their 4-bit expansions, for _ensure_binary_only
+_HEX_LETTER_RE = re.compile(r'[A-F]')
+_HEX_TO_BIN_TABLE = str.maketrans({
+    'A': '1010', 'B': '1011', 'C': '1100', 'D': '1101',
+    'E': '1110', 'F': '1111'
+})
+
+# Every hex digit to its 4-bit expansion, for strings that are entirely hex
+_HEX_STRING_RE = re.compile(r'[0-9A-F]+')
+_NIBBLE_TO_BIN_TABLE = str.maketrans({f'{digit:X}': f'{digit:04b}' for digit in range(16)})
+
+# Deletes 0 and 1, so a binary string translates to ''
+_DELETE_BINARY_DIGITS_TABLE = str.maketrans('', '', '01')
+
+# Values already written as VHDL literals, surrounding whitespace allowed:
+# a single-quoted character (single bit), a double-quoted string (bit
+# vector), a negative integer, or an integer with a digit other than 0/1.
+# Bare 0/1 patterns are ambiguous and left for type-based conversion.
+_PROPERLY_QUOTED_RE = re.compile(
+    r"""\s*(?:'.'|".+"|-\d+|[01]*(?:(?![01])\d)\d*)\s*""",
+    re.DOTALL
+)
+
+# Assertion report text by signal type. STD_LOGIC and INTEGER values can be
+# shown with 'image; vectors point at the waveform for the actual value.
+_ASSERTION_MESSAGES = {
+    "STD_LOGIC": ('"Test {test_num}: {signal_name} mismatch - expected {expected_value}, got " & '
+                  "std_logic'image(tb_{signal_name})"),
+    "STD_LOGIC_VECTOR": ('"Test {test_num}: {signal_name} mismatch - expected {expected_value} '
+                         '(check waveform for actual value)"'),
+    "INTEGER": ('"Test {test_num}: {signal_name} mismatch - expected {expected_value}, got " & '
+                "integer'image(tb_{signal_name})"),
+}
+_ASSERTION_MESSAGE_FALLBACK = '"Test {test_num}: {signal_name} mismatch - expected {expected_value}"'
+
+# Fixed text around the reset duration in the stimulus process
+_RESET_SEQUENCE_HEAD = "    -- Reset sequence\n    tb_rst <= '1';\n    wait for "
+_RESET_SEQUENCE_TAIL = " ns;\n    tb_rst <= '0';\n    wait for 20 ns;\n\n"
+
+
+@functools.lru_cache(maxsize=256)
+def _range_width(range_val: str) -> Optional[int]:
+    """Bit width of a literal downto range, parsed once per distinct range string."""
+    range_match = _DOWNTO_RANGE_RE.search(range_val)
+    if not range_match:
+        return None
+    return int(range_match.group(1)) - int(range_match.group(2)) + 1
+
+
+@dataclass(slots=True, frozen=True)
 class TestbenchData:
     """Data structure for testbench template substitution."""
     component_name: str
@@ -19,9 +76,9 @@ class TestbenchData:
     generics: str = ""
     generic_map: str = ""
 
-    def apply_to_template(self, template: str) -> str:
-        """Apply this data to a template string."""
-        return template.format(
+    def template_fields(self) -> Dict[str, str]:
+        """Return the template placeholder values."""
+        return dict(
             component_name=self.component_name,
             ports=self.ports,
             internal_signals=self.internal_signals,
@@ -32,6 +89,10 @@ class TestbenchData:
             generic_map=self.generic_map
         )
 
+    def apply_to_template(self, template: str) -> str:
+        """Apply this data to a template string."""
+        return render(template, self.template_fields())
+
 
 class TestbenchGenerator:
     """Generator for VHDL testbenches."""
@@ -39,193 +100,189 @@ class TestbenchGenerator:
     @staticmethod
     def generate_testbench_data(entity: VhdlEntity, config: Optional[TestbenchConfig] = None) -> TestbenchData:
         """Generate testbench data from entity and config."""
+        return TestbenchGenerator.compile_for_entity(entity)(config)
+
+    @staticmethod
+    def compile_for_entity(entity: VhdlEntity) -> Callable[[Optional[TestbenchConfig]], TestbenchData]:
+        """Precompute the config-independent parts of an entity's testbench.
+        
+        The returned function builds TestbenchData for one config; reuse it
+        when generating many testbenches for the same (unchanged) entity.
+        """
         component_name = entity.name
-        ports = TestbenchGenerator._generate_ports_string(entity.ports, entity.generics, config)
-        internal_signals = TestbenchGenerator._generate_internal_signals(entity.ports, entity.generics, config)
         port_connections = TestbenchGenerator._generate_port_connections(entity.ports)
-        clk_gen = TestbenchGenerator._generate_clock_generation(config)
-        stim_proc = TestbenchGenerator._generate_stimulus_process(entity.ports, config)
-
-        generics = TestbenchGenerator._generate_generics_string(entity.generics, config)
-        generic_map = TestbenchGenerator._generate_generic_map(entity.generics, config)
-        
-        return TestbenchData(
-            component_name=component_name,
-            ports=ports,
-            internal_signals=internal_signals,
-            port_connections=port_connections,
-            clk_gen=clk_gen,
-            stim_proc=stim_proc,
-            generics=generics,
-            generic_map=generic_map
-        )
+        
+        # First port wins for duplicate names, as with a linear scan
+        ports_by_name = {p.name: p for p in reversed(entity.ports)}
+        
+        # Without generics, port ranges never depend on the config
+        fixed_ports = fixed_internal_signals = None
+        if not entity.generics:
+            resolve_range = TestbenchGenerator._generic_range_resolver(entity.generics, None)
+            fixed_ports = TestbenchGenerator._generate_ports_string(entity.ports, resolve_range)
+            fixed_internal_signals = TestbenchGenerator._generate_internal_signals(entity.ports, resolve_range)
+        
+        def emit(config: Optional[TestbenchConfig] = None) -> TestbenchData:
+            ports, internal_signals = fixed_ports, fixed_internal_signals
+            if ports is None:
+                # Generic values are resolved once and shared by all port ranges
+                resolve_range = TestbenchGenerator._generic_range_resolver(entity.generics, config)
+                ports = TestbenchGenerator._generate_ports_string(entity.ports, resolve_range)
+                internal_signals = TestbenchGenerator._generate_internal_signals(entity.ports, resolve_range)
+            
+            clk_gen = TestbenchGenerator._generate_clock_generation(config)
+            stim_proc = TestbenchGenerator._generate_stimulus_process(entity.ports, config, ports_by_name)
+            
+            # Declaration and map use the same values, so pick them once
+            resolved_generics = TestbenchGenerator._resolve_generic_values(entity.generics, config)
+            generics = TestbenchGenerator._generate_generics_string(resolved_generics)
+            generic_map = TestbenchGenerator._generate_generic_map(resolved_generics)
+            
+            return TestbenchData(
+                component_name=component_name,
+                ports=ports,
+                internal_signals=internal_signals,
+                port_connections=port_connections,
+                clk_gen=clk_gen,
+                stim_proc=stim_proc,
+                generics=generics,
+                generic_map=generic_map
+            )
+        
+        return emit
 
     @staticmethod
-    def _generate_ports_string(ports: List[VhdlPort], generics: List[VhdlGeneric], config: Optional[TestbenchConfig]) -> str:
+    def _generate_ports_string(ports: List[VhdlPort], resolve_range: Callable[[str], str]) -> str:
         """Generate ports string for component declaration."""
         result = []
         
         for i, port in enumerate(ports):
-            port_line = f"        {port.name} : {port.direction.upper()} {port.signal_type.upper()}"
+            parts = ["        ", port.name, " : ", port.direction_upper, " ", port.signal_type_upper]
             
             if port.range:
                 # Resolve generic parameters in ranges
-                resolved_range = TestbenchGenerator._resolve_generic_range(port.range, generics, config)
-                port_line += resolved_range
+                parts.append(resolve_range(port.range))
             
             if i < len(ports) - 1:
-                port_line += ";"
+                parts.append(";")
             
-            result.append(port_line)
+            result.append("".join(parts))
         
         return "\n".join(result)
 
     @staticmethod
-    def _resolve_generic_range(range_val: str, generics: List[VhdlGeneric], config: Optional[TestbenchConfig]) -> str:
-        """Resolve generic parameters in port ranges."""
-        resolved = range_val
-        default_value = "32"
+    def _config_generics(config: Optional[TestbenchConfig]) -> Dict[str, str]:
+        """Return config generic overrides keyed by lowercase name."""
+        if not (config and config.generics):
+            return {}
+        return {name.lower(): value for name, value in config.generics.items()}
+
+    @staticmethod
+    def _generic_value(generic: VhdlGeneric, config_generics: Dict[str, object]) -> object:
+        """Pick a generic's value: config override, then entity default, then a type fallback.
+        
+        Empty values (0, "") count as unset at every step, so the declaration,
+        the generic map and the port ranges always agree.
+        """
+        fallback = "32" if generic.generic_type_upper == "INTEGER" else "8"
+        return config_generics.get(generic.name.lower()) or generic.default_value or fallback
+
+    @staticmethod
+    def _generic_range_resolver(generics: List[VhdlGeneric], config: Optional[TestbenchConfig]) -> Callable[[str], str]:
+        """Build a function that substitutes generic values into port ranges."""
+        config_generics = TestbenchGenerator._config_generics(config)
+        values = {}
         
-        # Replace generic parameters with their values
         for generic in generics:
             generic_name = generic.name.upper()
             
-            # Check if config overrides this generic
-            if config and config.generics:
-                # First try to get from config
-                value = config.generics.get(generic.name) or config.generics.get(generic_name)
-                if value:
-                    pass  # Use config value
-                elif generic.default_value:
-                    value = generic.default_value
-                else:
-                    value = default_value
-            else:
-                value = generic.default_value or default_value
+            value = str(TestbenchGenerator._generic_value(generic, config_generics))
             
-            # Replace both uppercase and original case
-            resolved = resolved.replace(generic_name, value)
-            resolved = resolved.replace(generic.name, value)
+            # Match both uppercase and original case
+            values[generic_name] = value
+            values[generic.name] = value
+        
+        if not values:
+            return lambda range_val: range_val
+        
+        # One pass per range; longest names first so prefixes never win
+        names = sorted(values, key=len, reverse=True)
+        generic_re = re.compile(r'\b(' + '|'.join(map(re.escape, names)) + r')\b')
+        
+        # Ports and internal signals share range strings; substitute each distinct one once
+        resolved = {}
+        
+        def resolve(range_val: str) -> str:
+            result = resolved.get(range_val)
+            if result is None:
+                result = resolved[range_val] = generic_re.sub(lambda m: values[m.group(1)], range_val)
+            return result
+        
+        return resolve
+
+    @staticmethod
+    def _resolve_generic_values(generics: List[VhdlGeneric], config: Optional[TestbenchConfig]) -> List[Tuple[VhdlGeneric, object]]:
+        """Pair each generic with its value for the component declaration and map."""
+        config_generics = TestbenchGenerator._config_generics(config)
+        resolved = []
+        
+        for generic in generics:
+            resolved.append((generic, TestbenchGenerator._generic_value(generic, config_generics)))
         
         return resolved
 
     @staticmethod
-    def _generate_generics_string(generics: List[VhdlGeneric], config: Optional[TestbenchConfig]) -> str:
+    def _generate_generics_string(resolved_generics: List[Tuple[VhdlGeneric, object]]) -> str:
         """Generate generics string for component declaration."""
-        if not generics:
+        if not resolved_generics:
             return ""
         
-        result = []
-        
-        for i, generic in enumerate(generics):
-            # Get the value for this generic
-            value = None
-            
-            # First check if config overrides this generic
-            if config and config.generics:
-                value = (config.generics.get(generic.name) or 
-                        config.generics.get(generic.name.upper()) or
-                        config.generics.get(generic.name.lower()))
-            
-            # If no config override, use default value from entity
-            if value is None:
-                value = generic.default_value
-            
-            # If still no value, use a sensible default
-            if value is None:
-                if generic.generic_type.upper() == "INTEGER":
-                    value = "32"
-                else:
-                    value = "8"
-            
-            # Format the generic declaration
-            generic_line = f"        {generic.name} : {generic.generic_type.upper()}"
-            if value:
-                generic_line += f" := {value}"
-            
-            # Add semicolon for all but the last generic
-            if i < len(generics) - 1:
-                generic_line += ";"
-            
-            result.append(generic_line)
+        # Format each generic declaration; the separator adds the semicolons
+        result = [
+            f"        {generic.name} : {generic.generic_type_upper} := {value}" if value
+            else f"        {generic.name} : {generic.generic_type_upper}"
+            for generic, value in resolved_generics
+        ]
         
-        # Wrap in Generic clause if we have generics
-        if result:
-            return f"\n    Generic (\n" + "\n".join(result) + "\n    );"
-        else:
-            return ""
+        # Wrap in Generic clause
+        return "\n    Generic (\n" + ";\n".join(result) + "\n    );"
 
     @staticmethod
-    def _generate_generic_map(generics: List[VhdlGeneric], config: Optional[TestbenchConfig]) -> str:
+    def _generate_generic_map(resolved_generics: List[Tuple[VhdlGeneric, object]]) -> str:
         """Generate generic map for component instantiation."""
-        if not generics:
+        if not resolved_generics:
             return ""
         
-        result = []
-        
-        for i, generic in enumerate(generics):
-            # Get the value for this generic (same logic as component declaration)
-            value = None
-            
-            # First check if config overrides this generic
-            if config and config.generics:
-                value = (config.generics.get(generic.name) or 
-                        config.generics.get(generic.name.upper()) or
-                        config.generics.get(generic.name.lower()))
-            
-            # If no config override, use default value from entity
-            if value is None:
-                value = generic.default_value
-            
-            # If still no value, use a sensible default
-            if value is None:
-                if generic.generic_type.upper() == "INTEGER":
-                    value = "32"
-                else:
-                    value = "8"
-            
-            # Format the generic mapping
-            map_line = f"		{generic.name} => {value}"
-            
-            # Add comma for all but the last generic
-            if i < len(generics) - 1:
-                map_line += ","
-            
-            result.append(map_line)
+        # Format each generic mapping; the separator adds the commas
+        result = [f"\t\t{generic.name} => {value}" for generic, value in resolved_generics]
         
-        # Wrap in generic map clause if we have generics
-        if result:
-            return f"\n\tgeneric map(\n" + "\n".join(result) + "\n\t)"
-        else:
-            return ""
+        # Wrap in generic map clause
+        return "\n\tgeneric map(\n" + ",\n".join(result) + "\n\t)"
 
     @staticmethod
-    def _generate_internal_signals(ports: List[VhdlPort], generics: List[VhdlGeneric], config: Optional[TestbenchConfig]) -> str:
+    def _generate_internal_signals(ports: List[VhdlPort], resolve_range: Callable[[str], str]) -> str:
         """Generate internal signals for testbench."""
         signals = []
         
         for port in ports:
-            signal_name = f"tb_{port.name}"
-            signal_decl = f"signal {signal_name} : {port.signal_type.upper()}"
+            signal_type = port.signal_type_upper
+            parts = ["signal tb_", port.name, " : ", signal_type]
             
             if port.range:
                 # Resolve generic parameters in ranges
-                resolved_range = TestbenchGenerator._resolve_generic_range(port.range, generics, config)
-                signal_decl += resolved_range
+                parts.append(resolve_range(port.range))
             
             # Add default values for testbench signals
-            signal_type = port.signal_type.upper()
             if signal_type == "STD_LOGIC":
-                signal_decl += " := '0'"  # Single bit: use single quotes
+                parts.append(" := '0';")  # Single bit: use single quotes
             elif signal_type == "STD_LOGIC_VECTOR":
-                signal_decl += " := (others => '0')"  # Vector initialization
+                parts.append(" := (others => '0');")  # Vector initialization
             elif signal_type == "INTEGER":
-                signal_decl += " := 0"  # Integer literals don't need quotes
+                parts.append(" := 0;")  # Integer literals don't need quotes
             else:
-                signal_decl += " := '0'"  # Default to single bit
+                parts.append(" := '0';")  # Default to single bit
             
-            signal_decl += ";"
-            signals.append(signal_decl)
+            signals.append("".join(parts))
         
         # Add clock signal if not present
         has_clk = any(p.name.lower() in ["clk", "clock"] for p in ports)
@@ -239,11 +296,9 @@ class TestbenchGenerator:
         """Generate port map connections."""
         connections = []
         
+        last = len(ports) - 1
         for i, port in enumerate(ports):
-            connection = f"        {port.name} => tb_{port.name}"
-            if i < len(ports) - 1:
-                connection += ","
-            connections.append(connection)
+            connections.append("".join(("        ", port.name, " => tb_", port.name, "," if i < last else "")))
         
         return "\n".join(connections)
 
@@ -259,9 +314,12 @@ class TestbenchGenerator:
         return f"    tb_clk <= '0';\n    wait for {half_period} ns;\n    tb_clk <= '1';\n    wait for {half_period} ns;"
 
     @staticmethod
-    def _generate_stimulus_process(ports: List[VhdlPort], config: Optional[TestbenchConfig]) -> str:
+    def _generate_stimulus_process(ports: List[VhdlPort], config: Optional[TestbenchConfig],
+                                   ports_by_name: Optional[Dict[str, VhdlPort]] = None) -> str:
         """Generate stimulus process."""
-        stimulus = []
+        # Lines are written newline-terminated into one buffer
+        stimulus = io.StringIO()
+        write = stimulus.write
         
         # Reset sequence
         reset_duration = 100
@@ -269,112 +327,112 @@ class TestbenchGenerator:
             reset_duration = config.reset_duration_ns
         
         if reset_duration > 0:
-            stimulus.append(f"    -- Reset sequence")
-            stimulus.append(f"    tb_rst <= '1';")
-            stimulus.append(f"    wait for {reset_duration} ns;")
-            stimulus.append(f"    tb_rst <= '0';")
-            stimulus.append(f"    wait for 20 ns;")
-            stimulus.append("")
+            write(f"{_RESET_SEQUENCE_HEAD}{reset_duration}{_RESET_SEQUENCE_TAIL}")
         
         # Generate test vectors if provided in config
         if config and config.test_vectors:
-            stimulus.append("    -- Test vectors")
+            write("    -- Test vectors\n")
             
-            # Sort test vectors by time to ensure chronological order
-            sorted_vectors = sorted(config.test_vectors, key=lambda v: v.time_ns)
+            if ports_by_name is None:
+                # First port wins for duplicate names, as with a linear scan
+                ports_by_name = {p.name: p for p in reversed(ports)}
+            to_literal = TestbenchGenerator._convert_to_vhdl_literal
+            assertion_message = TestbenchGenerator._generate_assertion_message
+            
+            # Sort test vectors by time to ensure chronological order; configs
+            # are usually written in order already, so check before sorting
+            sorted_vectors = config.test_vectors
+            if not all(a.time_ns <= b.time_ns for a, b in itertools.pairwise(sorted_vectors)):
+                sorted_vectors = sorted(sorted_vectors, key=operator.attrgetter('time_ns'))
             
             current_time = reset_duration + (20 if reset_duration > 0 else 0)  # Account for reset sequence
             
             for i, vector in enumerate(sorted_vectors):
                 if vector.description:
-                    stimulus.append(f"    -- Test {i + 1}: {vector.description} @{vector.time_ns}ns")
+                    write(f"    -- Test {i + 1}: {vector.description} @{vector.time_ns}ns\n")
                 else:
-                    stimulus.append(f"    -- Test vector {i + 1} @{vector.time_ns}ns")
+                    write(f"    -- Test vector {i + 1} @{vector.time_ns}ns\n")
                 
                 # Calculate wait time (difference from current time to target time)
                 wait_time = vector.time_ns - current_time
                 if wait_time > 0:
-                    stimulus.append(f"    wait for {wait_time} ns;")
+                    write(f"    wait for {wait_time} ns;\n")
                 elif wait_time < 0:
                     # Negative wait time - test vector is in the past, skip waiting
-                    stimulus.append(f"    -- Warning: Test vector time {vector.time_ns}ns is before current time {current_time}ns")
+                    write(f"    -- Warning: Test vector time {vector.time_ns}ns is before current time {current_time}ns\n")
                 
                 # Apply inputs
                 for signal, value in vector.inputs.items():
                     # Convert to proper VHDL syntax based on signal type
-                    corrected_value = TestbenchGenerator._convert_to_vhdl_literal(value, signal, ports)
-                    stimulus.append(f"    tb_{signal} <= {corrected_value};")
+                    corrected_value = to_literal(value, signal, ports_by_name)
+                    write(f"    tb_{signal} <= {corrected_value};\n")
                 
                 # Add small settling time after signal changes
-                stimulus.append("    wait for 1 ns;")
+                write("    wait for 1 ns;\n")
                 current_time = vector.time_ns + 1
                 
                 # Add assertions if expected outputs are provided
                 if vector.expected_outputs:
                     for signal, expected in vector.expected_outputs.items():
                         # Convert to proper VHDL syntax based on signal type
-                        corrected_expected = TestbenchGenerator._convert_to_vhdl_literal(expected, signal, ports)
+                        corrected_expected = to_literal(expected, signal, ports_by_name)
                         
                         # Generate detailed assertion with actual vs expected values
-                        signal_port = next((p for p in ports if p.name == signal), None)
-                        error_msg = TestbenchGenerator._generate_assertion_message(
-                            i + 1, signal, corrected_expected, signal_port
-                        )
+                        signal_port = ports_by_name.get(signal)
+                        error_msg = assertion_message(i + 1, signal, corrected_expected, signal_port)
                         
-                        stimulus.append(f"    assert tb_{signal} = {corrected_expected}")
-                        stimulus.append(f"        report {error_msg}")
-                        stimulus.append(f"        severity error;")
+                        write(f"    assert tb_{signal} = {corrected_expected}\n"
+                              f"        report {error_msg}\n"
+                              "        severity error;\n")
                 
-                stimulus.append("")
+                write("\n")
         else:
             # Generate basic test stimulus
-            stimulus.extend(TestbenchGenerator._generate_basic_test(ports))
+            TestbenchGenerator._generate_basic_test(ports, write)
         
-        return "\n".join(stimulus)
+        # Drop the final line's terminator, matching a newline join
+        return stimulus.getvalue()[:-1]
 
     @staticmethod
-    def _generate_basic_test(ports: List[VhdlPort]) -> List[str]:
-        """Generate basic test stimulus when no config is provided."""
-        test = ["    -- Basic stimulus"]
+    def _generate_basic_test(ports: List[VhdlPort], write: Callable[[str], object]) -> None:
+        """Write basic test stimulus lines when no config is provided."""
+        write("    -- Basic stimulus\n")
         
         for port in ports:
             if port.direction == "in" and port.name not in ["clk", "rst", "clock", "reset"]:
-                signal_type = port.signal_type.upper()
+                signal_type = port.signal_type_upper
                 if signal_type == "STD_LOGIC":
-                    test.extend([
-                        f"    tb_{port.name} <= '1';",  # Single bit: single quotes
-                        "    wait for 20 ns;",
-                        f"    tb_{port.name} <= '0';",  # Single bit: single quotes
-                        "    wait for 20 ns;"
-                    ])
+                    # Single bit: single quotes
+                    write(f"    tb_{port.name} <= '1';\n"
+                          "    wait for 20 ns;\n"
+                          f"    tb_{port.name} <= '0';\n"
+                          "    wait for 20 ns;\n")
                 elif signal_type == "STD_LOGIC_VECTOR":
-                    test.extend([
-                        f"    tb_{port.name} <= (others => '1');",  # Vector initialization
-                        "    wait for 20 ns;",
-                        f"    tb_{port.name} <= (others => '0');",  # Vector initialization
-                        "    wait for 20 ns;"
-                    ])
+                    # Vector initialization
+                    write(f"    tb_{port.name} <= (others => '1');\n"
+                          "    wait for 20 ns;\n"
+                          f"    tb_{port.name} <= (others => '0');\n"
+                          "    wait for 20 ns;\n")
         
-        test.append("")
-        return test
+        write("\n")
 
     @staticmethod
-    def _convert_to_vhdl_literal(value: str, signal_name: str, ports: List[VhdlPort]) -> str:
+    def _convert_to_vhdl_literal(value: str, signal_name: str, ports_by_name: Dict[str, VhdlPort]) -> str:
         """Convert config value to proper VHDL literal syntax based on signal type."""
-        
-        # Remove any existing quotes first to get the raw value
-        raw_value = value.strip().strip("'\"")
+        # Find the signal's port definition to determine type; vectors repeat
+        # the same values, so each (value, port) pair is converted only once
+        return _literal_for_port(value, ports_by_name.get(signal_name))
+
+    @staticmethod
+    def _convert_literal_for_port(value: str, signal_port: Optional[VhdlPort]) -> str:
+        """Convert config value to a VHDL literal for a known (or missing) port."""
         
         # If already properly quoted, return as-is
-        if TestbenchGenerator._is_properly_quoted_vhdl(value):
+        if _PROPERLY_QUOTED_RE.fullmatch(value):
             return value
         
-        # Find the signal's port definition to determine type
-        signal_port = None
-        for port in ports:
-            if port.name == signal_name:
-                signal_port = port
-                break
+        # Remove any existing quotes first to get the raw value
+        raw_value = value.strip().strip("'\"")
         
         if not signal_port:
             # Signal not found, make educated guess based on value
@@ -386,7 +444,7 @@ class TestbenchGenerator:
                 return f"'{raw_value}'"  # Single bit
         
         # Convert based on actual signal type
-        signal_type = signal_port.signal_type.upper()
+        signal_type = signal_port.signal_type_upper
         
         if signal_type == "STD_LOGIC":
             # Single bit: ensure it's a valid binary digit
@@ -413,34 +471,14 @@ class TestbenchGenerator:
         clean_value = value.upper().strip()
         
         # Check if this looks like a hex string (contains A-F)
-        if any(c in clean_value for c in 'ABCDEF'):
-            # Check if it's a valid hex string (all chars are hex digits)
-            if all(c in '0123456789ABCDEF' for c in clean_value):
-                try:
-                    # Convert entire hex string to binary
-                    hex_val = int(clean_value, 16)
-                    binary_str = bin(hex_val)[2:]  # Remove '0b' prefix
-                    
-                    # Ensure we have proper bit width (multiple of 4 for hex conversion)
-                    target_bits = len(clean_value) * 4
-                    binary_str = binary_str.zfill(target_bits)
-                    
-                    return binary_str
-                except ValueError:
-                    # If hex conversion fails, fall back to character replacement
-                    pass
-            
-            # Fallback: replace individual hex characters
-            hex_replacements = {
-                'A': '1010', 'B': '1011', 'C': '1100', 'D': '1101',
-                'E': '1110', 'F': '1111'
-            }
-            
-            result = clean_value
-            for hex_char, binary_equiv in hex_replacements.items():
-                result = result.replace(hex_char, binary_equiv)
+        if _HEX_LETTER_RE.search(clean_value):
+            # A valid hex string expands nibble by nibble to len * 4 bits,
+            # the same as int(value, 16) zero-filled, without the big int
+            if _HEX_STRING_RE.fullmatch(clean_value):
+                return clean_value.translate(_NIBBLE_TO_BIN_TABLE)
             
-            return result
+            # Fallback: replace individual hex characters in one pass
+            return clean_value.translate(_HEX_TO_BIN_TABLE)
         
         # If it's already binary or numeric, return as-is
         return clean_value
@@ -448,30 +486,11 @@ class TestbenchGenerator:
     @staticmethod
     def _generate_assertion_message(test_num: int, signal_name: str, expected_value: str, signal_port: Optional[VhdlPort]) -> str:
         """Generate detailed assertion failure message with actual vs expected values."""
-        
-        if not signal_port:
-            # Unknown signal type, use basic message
-            return f'"Test {test_num}: {signal_name} mismatch - expected {expected_value}"'
-        
-        signal_type = signal_port.signal_type.upper()
-        
-        if signal_type == "STD_LOGIC":
-            # For STD_LOGIC, show the actual value
-            return (f'"Test {test_num}: {signal_name} mismatch - expected {expected_value}, got " & '
-                   f"std_logic'image(tb_{signal_name})")
-        
-        elif signal_type == "STD_LOGIC_VECTOR":
-            # For STD_LOGIC_VECTOR, provide clear expected value and note to check waveform
-            return f'"Test {test_num}: {signal_name} mismatch - expected {expected_value} (check waveform for actual value)"'
-        
-        elif signal_type == "INTEGER":
-            # For INTEGER, convert to string
-            return (f'"Test {test_num}: {signal_name} mismatch - expected {expected_value}, got " & '
-                   f"integer'image(tb_{signal_name})")
-        
-        else:
-            # Unknown type, use basic message with expected value
-            return f'"Test {test_num}: {signal_name} mismatch - expected {expected_value}"'
+        # Unknown signals and types fall back to a basic message with the expected value
+        template = _ASSERTION_MESSAGE_FALLBACK
+        if signal_port:
+            template = _ASSERTION_MESSAGES.get(signal_port.signal_type_upper, template)
+        return template.format(test_num=test_num, signal_name=signal_name, expected_value=expected_value)
 
     @staticmethod
     def _size_to_signal(binary_value: str, port: VhdlPort) -> str:
@@ -481,13 +500,8 @@ class TestbenchGenerator:
             return binary_value
         
         # Try to extract bit width from range like "(7 downto 0)" or "(15 downto 0)"
-        import re
-        range_match = re.search(r'\((\d+)\s+downto\s+(\d+)\)', port.range)
-        if range_match:
-            high_bit = int(range_match.group(1))
-            low_bit = int(range_match.group(2))
-            target_width = high_bit - low_bit + 1
-            
+        target_width = _range_width(port.range)
+        if target_width is not None:
             if len(binary_value) > target_width:
                 # Truncate to fit (take least significant bits)
                 return binary_value[-target_width:]
@@ -501,24 +515,7 @@ class TestbenchGenerator:
     @staticmethod
     def _is_properly_quoted_vhdl(value: str) -> bool:
         """Check if value is already properly quoted for VHDL."""
-        value = value.strip()
-        
-        # Check for single-quoted single character (single bit)
-        if value.startswith("'") and value.endswith("'") and len(value) == 3:
-            return True
-        
-        # Check for double-quoted string (bit vector)  
-        if value.startswith('"') and value.endswith('"') and len(value) >= 3:
-            return True
-        
-        # Only treat clearly unambiguous integers as properly formatted
-        # Be conservative: only negative numbers and numbers with non-binary digits
-        if value.startswith('-') and value[1:].isdigit():
-            return True  # Negative numbers are clearly integers
-        if value.isdigit() and any(c not in '01' for c in value):
-            return True  # Numbers with digits other than 0,1 are clearly integers (e.g., "42", "123")
-        
-        return False
+        return _PROPERLY_QUOTED_RE.fullmatch(value) is not None
 
     @staticmethod
     def _looks_like_bit_vector(value: str) -> bool:
@@ -527,7 +524,10 @@ class TestbenchGenerator:
         clean_value = value.replace(' ', '')
         
         # If it's more than one character and all 0s/1s, it's probably a bit vector
-        if len(clean_value) > 1 and all(c in '01' for c in clean_value):
-            return True
-        
-        return False
+        return len(clean_value) > 1 and not clean_value.translate(_DELETE_BINARY_DIGITS_TABLE)
+
+
+@functools.lru_cache(maxsize=1024)
+def _literal_for_port(value: str, signal_port: Optional[VhdlPort]) -> str:
+    """VHDL literal for a config value, memoized per (value, port) pair."""
+    return TestbenchGenerator._convert_literal_for_port(value, signal_port)
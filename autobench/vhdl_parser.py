@@ -1,29 +1,61 @@
 """VHDL parser for extracting entity information."""
 
 import re
-from dataclasses import dataclass
-from typing import List, Optional
+import sys
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
 from pathlib import Path
 
-
-@dataclass
+# Patterns compiled once at import; the parser runs them for every file and port
+_LINE_BREAKS = '\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029'  # str.splitlines() boundaries
+_COMMENT_RE = re.compile(r'--[^' + _LINE_BREAKS + r']*')
+_WS_RE = re.compile(r'\s+')
+_ENTITY_RE = re.compile(r'entity\s+(\w+)\s+is')
+_GENERIC_RE = re.compile(r'generic\s*\((.*?)\)\s*;')
+_GENERIC_ITEM_RE = re.compile(r'(\w+)\s*:\s*(\w+)(?:\s*:=\s*([^;,)]+))?')
+_PORT_START_RE = re.compile(r'port\s*\(', re.IGNORECASE)
+_PORT_RE = re.compile(
+    r'(\w+)\s*:\s*(in|out|inout)\s+(\w+(?:_\w+)*)(?:\s*(\([^)]*\)))?',
+    re.IGNORECASE
+)
+_PAREN_RE = re.compile(r'[()]')
+_DECL_SCAN_RE = re.compile(r'[();]')
+
+
+@dataclass(frozen=True, slots=True)
 class VhdlPort:
     """Represents a VHDL port."""
     name: str
     direction: str  # "in", "out", "inout"
     signal_type: str  # "STD_LOGIC", "STD_LOGIC_VECTOR", etc.
     range: Optional[str] = None  # e.g., "(DATA_WIDTH-1 downto 0)"
+    # Upper-case spellings used by the generator, computed once per port
+    direction_upper: str = field(init=False, repr=False, compare=False)
+    signal_type_upper: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Interned so equal type strings across ports share one object
+        direction = sys.intern(self.direction)
+        signal_type = sys.intern(self.signal_type)
+        object.__setattr__(self, 'direction', direction)
+        object.__setattr__(self, 'signal_type', signal_type)
+        object.__setattr__(self, 'direction_upper', sys.intern(direction.upper()))
+        object.__setattr__(self, 'signal_type_upper', sys.intern(signal_type.upper()))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class VhdlGeneric:
     """Represents a VHDL generic parameter."""
     name: str
     generic_type: str
     default_value: Optional[str] = None
+    generic_type_upper: str = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self):
+        object.__setattr__(self, 'generic_type_upper', self.generic_type.upper())
 
-@dataclass
+
+@dataclass(slots=True)
 class VhdlEntity:
     """Represents a complete VHDL entity."""
     name: str
@@ -37,9 +69,14 @@ class VhdlParser:
     @staticmethod
     def parse_file(path: Path) -> VhdlEntity:
         """Parse a VHDL file and return entity information."""
+        return VhdlParser.parse_file_with_source(path)[1]
+
+    @staticmethod
+    def parse_file_with_source(path: Path) -> Tuple[str, VhdlEntity]:
+        """Parse a VHDL file and return its source text with the entity information."""
         try:
             content = path.read_text(encoding='utf-8')
-            return VhdlParser.parse_content(content)
+            return content, VhdlParser.parse_content(content)
         except FileNotFoundError:
             raise FileNotFoundError(f"Failed to read VHDL file '{path}': File not found")
         except Exception as e:
@@ -69,24 +106,21 @@ class VhdlParser:
     @staticmethod
     def _clean_content(content: str) -> str:
         """Remove comments and normalize whitespace."""
-        # Remove single-line comments
-        comment_re = re.compile(r'--.*$', re.MULTILINE)
-        lines = []
-        
-        for line in content.splitlines():
-            cleaned_line = comment_re.sub('', line)
-            lines.append(cleaned_line)
+        # splitlines() semantics: a single trailing line break adds no space
+        if content.endswith('\r\n'):
+            content = content[:-2]
+        elif content and content[-1] in _LINE_BREAKS:
+            content = content[:-1]
         
-        # Join lines and normalize whitespace
-        joined = ' '.join(lines)
-        normalized = re.sub(r'\s+', ' ', joined)
-        return normalized.lower()
+        # Remove comments over the whole text; the line breaks they stop at
+        # then collapse with the surrounding whitespace
+        uncommented = _COMMENT_RE.sub('', content)
+        return _WS_RE.sub(' ', uncommented).lower()
 
     @staticmethod
     def _extract_entity_name(content: str) -> str:
         """Extract entity name from cleaned content."""
-        entity_re = re.compile(r'entity\s+(\w+)\s+is')
-        match = entity_re.search(content)
+        match = _ENTITY_RE.search(content)
         if match:
             return match.group(1)
         else:
@@ -98,15 +132,13 @@ class VhdlParser:
         generics = []
         
         # Look for generic section
-        generic_re = re.compile(r'generic\s*\((.*?)\)\s*;')
-        match = generic_re.search(content)
+        match = _GENERIC_RE.search(content)
         
         if match:
             generic_content = match.group(1)
             
             # Parse individual generics
-            generic_item_re = re.compile(r'(\w+)\s*:\s*(\w+)(?:\s*:=\s*([^;,)]+))?')
-            for item_match in generic_item_re.finditer(generic_content):
+            for item_match in _GENERIC_ITEM_RE.finditer(generic_content):
                 default_val = None
                 if item_match.group(3):
                     default_val = item_match.group(3).strip()
@@ -125,23 +157,22 @@ class VhdlParser:
         ports = []
         
         # Find the start of the port section
-        port_start_re = re.compile(r'port\s*\(', re.IGNORECASE)
-        start_match = port_start_re.search(content)
+        start_match = _PORT_START_RE.search(content)
         
         if start_match:
             start_pos = start_match.end() - 1  # Position of the opening '('
             
-            # Find the matching closing parenthesis
-            paren_count = 0
+            # Find the matching closing parenthesis, visiting only paren characters
+            paren_count = 1
             end_pos = None
             
-            for i, ch in enumerate(content[start_pos:], start_pos):
-                if ch == '(':
+            for paren in _PAREN_RE.finditer(content, start_pos + 1):
+                if paren.group() == '(':
                     paren_count += 1
-                elif ch == ')':
+                else:
                     paren_count -= 1
                     if paren_count == 0:
-                        end_pos = i
+                        end_pos = paren.start()
                         break
             
             if end_pos:
@@ -162,26 +193,26 @@ class VhdlParser:
     def _split_port_declarations(content: str) -> List[str]:
         """Split port declarations by semicolons, respecting parentheses."""
         declarations = []
-        current = ""
+        start = 0
         paren_depth = 0
         
-        for ch in content:
+        # Visit only parens and semicolons; declarations are sliced, not grown
+        for token in _DECL_SCAN_RE.finditer(content):
+            ch = token.group()
             if ch == '(':
                 paren_depth += 1
-                current += ch
             elif ch == ')':
                 paren_depth -= 1
-                current += ch
-            elif ch == ';' and paren_depth == 0:
-                if current.strip():
-                    declarations.append(current.strip())
-                    current = ""
-            else:
-                current += ch
+            elif paren_depth == 0:
+                current = content[start:token.start()].strip()
+                if current:
+                    declarations.append(current)
+                start = token.end()
         
         # Handle the last declaration if it doesn't end with semicolon
-        if current.strip():
-            declarations.append(current.strip())
+        current = content[start:].strip()
+        if current:
+            declarations.append(current)
         
         return declarations
 
@@ -190,15 +221,9 @@ class VhdlParser:
         """Parse a single port declaration."""
         # Clean up the declaration
         cleaned = decl.strip().replace('\n', ' ').replace('\r', '')
-        cleaned = re.sub(r'\s+', ' ', cleaned)
-        
-        # More flexible regex that handles ranges better
-        port_re = re.compile(
-            r'(\w+)\s*:\s*(in|out|inout)\s+(\w+(?:_\w+)*)(?:\s*(\([^)]*\)))?',
-            re.IGNORECASE
-        )
+        cleaned = _WS_RE.sub(' ', cleaned)
         
-        match = port_re.search(cleaned)
+        match = _PORT_RE.search(cleaned)
         if match:
             range_val = match.group(4) if match.group(4) else None
             
@@ -0,0 +1,126 @@
+"""Shared fixtures for the test suite.
+
+Session-scoped fixtures hold only immutable or memoized values, so every
+test module runs correctly on its own or in any pytest-xdist worker.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from autobench import parse_cache
+from autobench.ai_integration import AIConfigGenerator
+from autobench.vhdl_parser import VhdlEntity, VhdlPort
+from autobench.testbench_generator import TestbenchGenerator
+
+
+@pytest.fixture(autouse=True)
+def isolated_parse_cache(tmp_path, monkeypatch):
+    """Keep parsed entities out of the user's cache directory and out of other tests."""
+    monkeypatch.setattr(parse_cache, "CACHE_DIR", tmp_path / "parse-cache")
+    parse_cache._parse_memo.cache_clear()
+    yield
+    parse_cache._parse_memo.cache_clear()
+
+
+@pytest.fixture
+def mock_genai_client():
+    """Patch google.genai.Client for one test and yield the mock class."""
+    with patch("google.genai.Client") as client_class:
+        yield client_class
+
+
+@pytest.fixture(scope="session")
+def ai_generator():
+    """One AIConfigGenerator for the stateless parsing helpers."""
+    # The Vertex AI client is created lazily, and these helpers never touch it
+    return AIConfigGenerator(project_id="test-project")
+
+
+@pytest.fixture(scope="session")
+def generate_testbench():
+    """Memoized TestbenchGenerator.generate_testbench_data, keyed by value.
+
+    Entities and configs are plain dataclasses, so their reprs identify them;
+    TestbenchData is frozen, so sharing the results is safe.
+    """
+    cache = {}
+
+    def generate(entity, config=None):
+        key = (repr(entity), repr(config))
+        if key not in cache:
+            cache[key] = TestbenchGenerator.generate_testbench_data(entity, config)
+        return cache[key]
+
+    return generate
+
+
+@pytest.fixture(scope="session")
+def stim_index():
+    """Split generated stimulus once into (text, lines, set of stripped lines)."""
+    def index(stimulus):
+        lines = stimulus.splitlines()
+        return stimulus, lines, {line.strip() for line in lines}
+
+    return index
+
+
+@pytest.fixture(scope="session")
+def io_test_entity():
+    """Clocked entity with std_logic, vector and integer inputs and outputs."""
+    return VhdlEntity(
+        name="test_entity",
+        generics=[],
+        ports=[
+            VhdlPort("clk", "in", "std_logic"),
+            VhdlPort("enable", "in", "std_logic"),
+            VhdlPort("data_in", "in", "std_logic_vector", "(7 downto 0)"),
+            VhdlPort("count", "in", "integer"),
+            VhdlPort("ready", "out", "std_logic"),
+            VhdlPort("data_out", "out", "std_logic_vector", "(7 downto 0)")
+        ]
+    )
+
+
+@pytest.fixture(scope="module")
+def timing_test_entity():
+    """Clocked entity with a single-bit and a vector input."""
+    return VhdlEntity(
+        name="timing_test",
+        generics=[],
+        ports=[
+            VhdlPort("clk", "in", "std_logic"),
+            VhdlPort("enable", "in", "std_logic"),
+            VhdlPort("data", "in", "std_logic_vector", "(7 downto 0)")
+        ]
+    )
+
+
+@pytest.fixture(scope="module")
+def assertion_test_entity():
+    """Entity with one input and one output of each literal type."""
+    return VhdlEntity(
+        name="assertion_test",
+        generics=[],
+        ports=[
+            VhdlPort("bit_signal", "in", "std_logic"),
+            VhdlPort("vector_signal", "in", "std_logic_vector", "(7 downto 0)"),
+            VhdlPort("int_signal", "in", "integer"),
+            VhdlPort("bit_out", "out", "std_logic"),
+            VhdlPort("vector_out", "out", "std_logic_vector", "(7 downto 0)"),
+            VhdlPort("int_out", "out", "integer")
+        ]
+    )
+
+
+@pytest.fixture(scope="module")
+def multi_signal_test_entity():
+    """Output-only entity for checking several signals in one test vector."""
+    return VhdlEntity(
+        name="multi_signal_test",
+        generics=[],
+        ports=[
+            VhdlPort("ready", "out", "std_logic"),
+            VhdlPort("valid", "out", "std_logic"),
+            VhdlPort("data", "out", "std_logic_vector", "(3 downto 0)")
+        ]
+    )
@@ -1,24 +1,23 @@
 """Tests for absolute timing in test vectors."""
 
+import re
+
 import pytest
 from autobench.vhdl_parser import VhdlEntity, VhdlPort
 from autobench.config import TestbenchConfig, TestVector
 from autobench.testbench_generator import TestbenchGenerator
 
+_WAIT_RE = re.compile(r"wait for (-?\d+) ns;")
+
+
+def _wait_ns_set(stimulus):
+    """Collect every 'wait for N ns;' duration in the stimulus in one pass."""
+    return {int(m.group(1)) for m in _WAIT_RE.finditer(stimulus)}
 
-def test_absolute_timing_calculation():
+
+def test_absolute_timing_calculation(timing_test_entity, generate_testbench):
     """Test that test vector times are treated as absolute timestamps."""
     
-    entity = VhdlEntity(
-        name="timing_test",
-        generics=[],
-        ports=[
-            VhdlPort("clk", "in", "std_logic"),
-            VhdlPort("enable", "in", "std_logic"),
-            VhdlPort("data", "in", "std_logic_vector", "(7 downto 0)")
-        ]
-    )
-    
     # Test vectors with absolute timestamps
     test_vectors = [
         TestVector(
@@ -43,11 +42,9 @@ def test_absolute_timing_calculation():
         test_vectors=test_vectors
     )
     
-    testbench_data = TestbenchGenerator.generate_testbench_data(entity, config)
+    testbench_data = generate_testbench(timing_test_entity, config)
     stimulus = testbench_data.stim_proc
     
-    lines = stimulus.split('\n')
-    
     # Find the relevant sections and verify timing
     # Should see:
     # 1. Reset for 50ns, then 20ns settling = 70ns total before first test
@@ -58,25 +55,21 @@ def test_absolute_timing_calculation():
     # 6. Wait 48ns more to reach 300ns (300-252=48)
     
     # Look for the wait statements
-    wait_statements = [line.strip() for line in lines if 'wait for' in line and 'ns' in line]
+    waits = _wait_ns_set(stimulus)
     
     # Should have: reset wait (50ns), settling wait (20ns), then calculated waits
-    assert "wait for 50 ns;" in wait_statements  # Reset duration
-    assert "wait for 20 ns;" in wait_statements  # Reset settling
+    assert 50 in waits  # Reset duration
+    assert 20 in waits  # Reset settling
     
     # The test vector waits should be calculated as differences
     # After reset (70ns), wait 30ns to reach 100ns
-    assert "wait for 30 ns;" in wait_statements or "wait for 100 ns;" in wait_statements
+    assert 30 in waits or 100 in waits
     
     # After first test (101ns), wait to reach 250ns
-    wait_149_found = any("wait for 149 ns;" in stmt for stmt in wait_statements)
-    wait_150_found = any("wait for 150 ns;" in stmt for stmt in wait_statements) 
-    assert wait_149_found or wait_150_found  # Allow for small variations
+    assert 149 in waits or 150 in waits  # Allow for small variations
     
     # After second test (252ns), wait to reach 300ns  
-    wait_48_found = any("wait for 48 ns;" in stmt for stmt in wait_statements)
-    wait_50_found = any("wait for 50 ns;" in stmt for stmt in wait_statements)
-    assert wait_48_found or wait_50_found
+    assert 48 in waits or 50 in waits
 
 
 def test_zero_time_test_vector():
@@ -111,11 +104,11 @@ def test_zero_time_test_vector():
     
     # First test vector should apply immediately (no wait before it)
     # Second test vector should wait 50ns from start
-    lines = stimulus.split('\n')
+    waits = _wait_ns_set(stimulus)
     
     # Should not have negative wait times or skip the first test
-    assert "wait for 0 ns;" not in stimulus  # No zero waits
-    assert ("wait for 50 ns;" in stimulus or "wait for 49 ns;" in stimulus)  # Wait to second test (accounting for 1ns settling)
+    assert 0 not in waits  # No zero waits
+    assert 50 in waits or 49 in waits  # Wait to second test (accounting for 1ns settling)
     
     # Both test vectors should be applied
     assert "Reset at time 0" in stimulus
@@ -5,9 +5,9 @@ from autobench.ai_integration import AIConfigGenerator
 from autobench.vhdl_parser import VhdlEntity, VhdlPort
 
 
-def test_extract_toml_with_explanatory_text():
+def test_extract_toml_with_explanatory_text(ai_generator):
     """Test extraction of TOML from AI response with explanatory text."""
-    generator = AIConfigGenerator(project_id='test-project')
+    generator = ai_generator
     
     # Simulate problematic AI response with explanation before TOML
     ai_response = """# AI-generated testbench configuration for a LIFO (Last-In, First-Out) stack.
@@ -51,9 +51,9 @@ This configuration provides comprehensive testing for the LIFO stack implementat
     assert "This configuration provides" not in toml_content
 
 
-def test_extract_toml_without_code_blocks():
+def test_extract_toml_without_code_blocks(ai_generator):
     """Test extraction when AI doesn't use code blocks properly."""
-    generator = AIConfigGenerator(project_id='test-project')
+    generator = ai_generator
     
     # AI response without proper code blocks
     ai_response = """Here's the configuration you requested:
@@ -86,9 +86,9 @@ This should work for your testbench."""
     assert "This should work" not in toml_content
 
 
-def test_clean_trailing_text():
+def test_clean_trailing_text(ai_generator):
     """Test removal of trailing explanatory text."""
-    generator = AIConfigGenerator(project_id='test-project')
+    generator = ai_generator
     
     toml_with_explanation = """clock_period_ns = 10
 
@@ -115,9 +115,9 @@ You can modify these values as needed for your specific requirements."""
     assert "You can modify these values" not in cleaned
 
 
-def test_looks_like_toml_validation():
+def test_looks_like_toml_validation(ai_generator):
     """Test enhanced TOML validation."""
-    generator = AIConfigGenerator(project_id='test-project')
+    generator = ai_generator
     
     # Valid TOML snippets
     valid_toml = """
@@ -5,7 +5,7 @@ from unittest.mock import Mock, patch
 from pathlib import Path
 
 from autobench.ai_integration import AIConfigGenerator
-from autobench.vhdl_parser import VhdlEntity, VhdlPort, VhdlGeneric
+from autobench.vhdl_parser import VhdlEntity, VhdlParser, VhdlPort, VhdlGeneric
 
 
 @patch.dict('os.environ', {}, clear=True)  # Clear environment
@@ -15,20 +15,23 @@ def test_ai_config_generator_requires_project_id():
         AIConfigGenerator()
 
 
-@patch('google.genai.Client')
-def test_ai_config_generator_init(mock_client_class):
+def test_ai_config_generator_init(mock_genai_client):
     """Test AIConfigGenerator initialization."""
     mock_client = Mock()
-    mock_client_class.return_value = mock_client
+    mock_genai_client.return_value = mock_client
     
     generator = AIConfigGenerator(project_id='test-project')
     
-    mock_client_class.assert_called_once_with(
+    # The client is only built when first used, then reused
+    mock_genai_client.assert_not_called()
+    assert generator.client == mock_client
+    assert generator.client == mock_client
+    
+    mock_genai_client.assert_called_once_with(
         vertexai=True,
         project='test-project',
         location='us-central1'
     )
-    assert generator.client == mock_client
 
 
 def test_build_prompt():
@@ -58,9 +61,9 @@ def test_build_prompt():
     assert "TOML" in prompt
 
 
-def test_extract_toml_from_response():
+def test_extract_toml_from_response(ai_generator):
     """Test TOML extraction from AI response."""
-    generator = AIConfigGenerator(project_id='test-project')
+    generator = ai_generator
     
     # Test with explicit toml code blocks
     response_with_toml_blocks = """
@@ -109,9 +112,34 @@ def test_extract_toml_from_response():
     assert "[generics]" in toml_content
 
 
-def test_looks_like_toml():
+def test_find_fenced_block_uppercase_fence_after_non_ascii_text(ai_generator):
+    """Test that an uppercase fence is sliced correctly after text that lower() lengthens."""
+    response = "İİİ Here is the config:\n```TOML\nclock_period_ns = 10\n```\n"
+    
+    assert ai_generator._find_fenced_block(response) == "clock_period_ns = 10"
+
+
+def test_find_fenced_block_skips_blocks_that_are_not_toml(ai_generator):
+    """Test that an example code block before the configuration is skipped."""
+    response = (
+        "The entity under test:\n```\nentity foo is end;\n```\n"
+        "And the configuration:\n```\nclock_period_ns = 10\n```\n"
+    )
+    
+    assert ai_generator._find_fenced_block(response) == "clock_period_ns = 10"
+    
+    # A block after a ```vhdl example is still found
+    response = "```vhdl\nentity foo is end;\n```\nConfig:\n```\nclock_period_ns = 10\n```"
+    assert ai_generator._find_fenced_block(response) == "clock_period_ns = 10"
+    
+    # A fenced toml block wins over an earlier bare block
+    response = "```\nclock_period_ns = 5\n```\n```toml\nclock_period_ns = 10\n```"
+    assert ai_generator._find_fenced_block(response) == "clock_period_ns = 10"
+
+
+def test_looks_like_toml(ai_generator):
     """Test TOML validation function."""
-    generator = AIConfigGenerator(project_id='test-project')
+    generator = ai_generator
     
     # Valid TOML-like content
     assert generator._looks_like_toml("key = value\n[section]")
@@ -138,7 +166,7 @@ def test_parse_ai_response_fallback():
     invalid_response = "This is not valid TOML at all!"
     
     # Since our extraction is now more robust, let's test with truly invalid TOML syntax
-    with patch('autobench.config.generate_baseline_config') as mock_baseline:
+    with patch('autobench.ai_integration.generate_baseline_config') as mock_baseline:
         mock_baseline.return_value = Mock()
         
         # The improved extraction might make this look like TOML, so the fallback
@@ -153,41 +181,247 @@ def test_parse_ai_response_fallback():
             pass
 
 
-@patch.dict('os.environ', {'GOOGLE_CLOUD_PROJECT': 'test-project'})
-def test_generate_ai_config_function():
+class _StubGenerator:
+    """Minimal AIConfigGenerator stand-in that records its calls."""
+    
+    instances = []
+    
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.calls = []
+        self.config = object()
+        self.last_entity = VhdlEntity(name="counter", generics=[], ports=[])
+        _StubGenerator.instances.append(self)
+    
+    def generate_config(self, *args):
+        self.calls.append(args)
+        return self.config
+
+
+class _UnusedParser:
+    """Parser stand-in that fails if the entity is parsed a second time."""
+    
+    @staticmethod
+    def parse_file(path):
+        raise AssertionError("generate_ai_config re-parsed the VHDL file")
+
+
+def test_generate_ai_config_function(monkeypatch):
     """Test the main generate_ai_config function."""
-    # Create a temporary VHDL file
-    vhdl_content = """
+    from autobench import ai_integration
+    
+    saved = []
+    _StubGenerator.instances.clear()
+    monkeypatch.setattr(ai_integration, "AIConfigGenerator", _StubGenerator)
+    monkeypatch.setattr(ai_integration, "save_config", lambda config, path: saved.append((config, path)))
+    monkeypatch.setattr(ai_integration, "VhdlParser", _UnusedParser)
+    
+    result_path = ai_integration.generate_ai_config(Path("/tmp/test.vhd"), verbose=True)
+    
+    # Check that the right methods were called
+    [generator] = _StubGenerator.instances
+    assert len(generator.calls) == 1
+    
+    # The entity parsed by the generator is reused for the filename
+    assert result_path == Path("counter_ai_config.toml")
+    assert saved == [(generator.config, result_path)]
+
+
+def test_generate_config_streams_until_toml_block_closes(tmp_path):
+    """Test that streaming stops once the TOML code block is complete."""
+    generator = AIConfigGenerator(project_id='test-project')
+    
+    vhdl_file = tmp_path / "counter.vhd"
+    vhdl_file.write_text("""
     entity counter is
         port (
             clk : in std_logic;
             count : out integer
         );
     end entity;
-    """
+    """, encoding='utf-8')
     
-    with patch('autobench.ai_integration.AIConfigGenerator') as mock_generator_class:
-        mock_generator = Mock()
-        mock_config = Mock()
-        mock_generator.generate_config.return_value = mock_config
-        mock_generator_class.return_value = mock_generator
-        
-        with patch('autobench.ai_integration.save_config') as mock_save:
-            with patch('autobench.ai_integration.VhdlParser') as mock_parser:
-                mock_entity = Mock()
-                mock_entity.name = "counter"
-                mock_parser.parse_file.return_value = mock_entity
-                
-                from autobench.ai_integration import generate_ai_config
-                
-                # Use a temporary file path
-                vhdl_path = Path("/tmp/test.vhd")
-                
-                result_path = generate_ai_config(vhdl_path, verbose=True)
-                
-                # Check that the right methods were called
-                mock_generator_class.assert_called_once()
-                mock_generator.generate_config.assert_called_once()
-                mock_save.assert_called_once()
-                
-                assert result_path == Path("counter_ai_config.toml")
+    consumed = []
+    
+    def fake_stream():
+        for text in ["```to", "ml\nclock_period_ns = 20\n", "reset_duration_ns = 40\n`", "``", "\nTrailing text"]:
+            consumed.append(text)
+            yield Mock(text=text)
+    
+    generator.client = Mock()
+    generator.client.models.generate_content_stream.return_value = fake_stream()
+    
+    config = generator.generate_config(vhdl_file)
+    
+    assert config.clock_period_ns == 20
+    assert config.reset_duration_ns == 40
+    # The trailing chunk after the closing fence is never requested
+    assert "\nTrailing text" not in consumed
+
+
+def test_generate_ai_configs_runs_requests_concurrently(tmp_path, monkeypatch, mock_genai_client):
+    """Test batch generation fans out requests and saves one config per file."""
+    import asyncio
+    from unittest.mock import AsyncMock
+    from autobench.ai_integration import generate_ai_configs
+    
+    vhdl_files = []
+    for name in ("counter", "fifo", "alu"):
+        vhdl_file = tmp_path / f"{name}.vhd"
+        vhdl_file.write_text(f"entity {name} is port (clk : in std_logic); end entity;", encoding='utf-8')
+        vhdl_files.append(vhdl_file)
+    
+    in_flight = 0
+    peak = 0
+    
+    async def fake_generate_content(model, contents):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return Mock(text="```toml\nclock_period_ns = 10\n```")
+    
+    mock_client = Mock()
+    mock_client.aio.models.generate_content = AsyncMock(side_effect=fake_generate_content)
+    mock_genai_client.return_value = mock_client
+    monkeypatch.chdir(tmp_path)
+    
+    with patch.object(VhdlParser, 'parse_content', wraps=VhdlParser.parse_content) as mock_parse:
+        results = generate_ai_configs(vhdl_files, project_id='test-project', max_concurrent_requests=2)
+    
+    assert results == [
+        (Path("counter_ai_config.toml"), None),
+        (Path("fifo_ai_config.toml"), None),
+        (Path("alu_ai_config.toml"), None),
+    ]
+    assert all((tmp_path / p).exists() for p, _ in results)
+    assert mock_client.aio.models.generate_content.await_count == 3
+    assert peak == 2  # Bounded by the semaphore
+    assert mock_parse.call_count == 3  # Each file is parsed once
+
+
+def test_generate_ai_configs_saves_successes_when_one_request_fails(tmp_path, monkeypatch, mock_genai_client):
+    """Test that a failed request is reported per file without discarding the others."""
+    from unittest.mock import AsyncMock
+    from autobench.ai_integration import generate_ai_configs
+    
+    vhdl_files = []
+    for name in ("counter", "fifo"):
+        vhdl_file = tmp_path / f"{name}.vhd"
+        vhdl_file.write_text(f"entity {name} is port (clk : in std_logic); end entity;", encoding='utf-8')
+        vhdl_files.append(vhdl_file)
+    
+    async def fake_generate_content(model, contents):
+        if "entity fifo" in contents:
+            raise RuntimeError("quota exceeded")
+        return Mock(text="```toml\nclock_period_ns = 10\n```")
+    
+    mock_client = Mock()
+    mock_client.aio.models.generate_content = AsyncMock(side_effect=fake_generate_content)
+    mock_genai_client.return_value = mock_client
+    monkeypatch.chdir(tmp_path)
+    
+    results = generate_ai_configs(vhdl_files, project_id='test-project')
+    
+    assert results[0] == (Path("counter_ai_config.toml"), None)
+    assert (tmp_path / "counter_ai_config.toml").exists()
+    assert results[1][0] is None
+    assert "quota exceeded" in results[1][1]
+    assert not (tmp_path / "fifo_ai_config.toml").exists()
+
+
+def test_generate_ai_configs_rejects_colliding_entity_names(tmp_path, monkeypatch, mock_genai_client):
+    """Test that two files defining the same entity are rejected before any request."""
+    from unittest.mock import AsyncMock
+    from autobench.ai_integration import generate_ai_configs
+    
+    vhdl_files = []
+    for directory in ("a", "b"):
+        (tmp_path / directory).mkdir()
+        vhdl_file = tmp_path / directory / "counter.vhd"
+        vhdl_file.write_text("entity counter is port (clk : in std_logic); end entity;", encoding='utf-8')
+        vhdl_files.append(vhdl_file)
+    
+    mock_client = Mock()
+    mock_client.aio.models.generate_content = AsyncMock()
+    mock_genai_client.return_value = mock_client
+    monkeypatch.chdir(tmp_path)
+    
+    with pytest.raises(ValueError, match="counter_ai_config.toml"):
+        generate_ai_configs(vhdl_files, project_id='test-project')
+    
+    mock_client.aio.models.generate_content.assert_not_awaited()
+    assert not (tmp_path / "counter_ai_config.toml").exists()
+
+
+def test_parse_ai_response_prose_skips_toml_parser(ai_generator):
+    """Test that a response with no TOML-looking lines goes straight to the baseline."""
+    entity = VhdlEntity(name="test_entity", generics=[], ports=[VhdlPort("clk", "in", "std_logic")])
+    
+    with patch('autobench.ai_integration.generate_baseline_config') as mock_baseline, \
+            patch('autobench.ai_integration.tomllib.loads') as mock_loads:
+        config = ai_generator._parse_ai_response("This is not valid TOML at all!", entity)
+    
+    mock_loads.assert_not_called()
+    mock_baseline.assert_called_once_with(entity)
+    assert config is mock_baseline.return_value
+
+
+def test_parse_ai_response_fast_path_skips_extraction():
+    """Test that a response that is already TOML is parsed directly."""
+    generator = AIConfigGenerator(project_id='test-project')
+    entity = VhdlEntity(name="test_entity", generics=[], ports=[])
+    
+    response = """```toml
+clock_period_ns = 12
+
+[[test_vectors]]
+time_ns = 100
+
+[test_vectors.inputs]
+enable = "1"
+```"""
+    
+    with patch.object(generator, '_extract_toml_from_response') as mock_extract:
+        config = generator._parse_ai_response(response, entity)
+    
+    mock_extract.assert_not_called()
+    assert config.clock_period_ns == 12
+    assert config.test_vectors[0].inputs == {"enable": "1"}
+
+
+def test_generate_config_retries_transient_errors(tmp_path):
+    """Test that transient Vertex AI errors are retried with backoff."""
+    from google.genai import errors
+    
+    generator = AIConfigGenerator(project_id='test-project', max_retries=2)
+    
+    vhdl_file = tmp_path / "counter.vhd"
+    vhdl_file.write_text("entity counter is port (clk : in std_logic); end entity;", encoding='utf-8')
+    
+    unavailable = errors.ServerError(503, {'error': {'code': 503, 'message': 'busy', 'status': 'UNAVAILABLE'}})
+    generator.client = Mock()
+    generator.client.models.generate_content_stream.side_effect = [
+        unavailable,
+        iter([Mock(text="```toml\nclock_period_ns = 30\n```")])
+    ]
+    
+    with patch('autobench.ai_integration.time.sleep') as mock_sleep:
+        config = generator.generate_config(vhdl_file)
+    
+    assert config.clock_period_ns == 30
+    assert generator.client.models.generate_content_stream.call_count == 2
+    mock_sleep.assert_called_once()
+    
+    # Non-transient errors fail immediately
+    bad_request = errors.ClientError(400, {'error': {'code': 400, 'message': 'bad', 'status': 'INVALID_ARGUMENT'}})
+    generator.client.models.generate_content_stream.side_effect = bad_request
+    generator.client.models.generate_content_stream.reset_mock()
+    
+    with patch('autobench.ai_integration.time.sleep') as mock_sleep:
+        with pytest.raises(RuntimeError, match="Failed to generate AI configuration"):
+            generator.generate_config(vhdl_file)
+    
+    assert generator.client.models.generate_content_stream.call_count == 1
+    mock_sleep.assert_not_called()
@@ -1,9 +1,10 @@
 """Tests for automatic VHDL literal quoting based on signal types."""
 
 import pytest
+from unittest.mock import patch
 from autobench.vhdl_parser import VhdlEntity, VhdlPort
 from autobench.config import TestbenchConfig, TestVector
-from autobench.testbench_generator import TestbenchGenerator
+from autobench.testbench_generator import TestbenchGenerator, _literal_for_port
 
 
 def test_automatic_quoting_conversion():
@@ -116,6 +117,7 @@ def test_convert_to_vhdl_literal():
         VhdlPort("count", "in", "integer"),
         VhdlPort("unknown", "in", "custom_type")
     ]
+    ports = {port.name: port for port in ports}
     
     # Test STD_LOGIC conversion
     assert TestbenchGenerator._convert_to_vhdl_literal("1", "enable", ports) == "'1'"
@@ -137,6 +139,24 @@ def test_convert_to_vhdl_literal():
     assert TestbenchGenerator._convert_to_vhdl_literal('"1010"', "data", ports) == '"1010"'
 
 
+def test_convert_to_vhdl_literal_memoizes_per_port():
+    """Test that a repeated (value, port) pair is converted only once."""
+    _literal_for_port.cache_clear()
+    ports = {
+        "data": VhdlPort("data", "in", "std_logic_vector", "(3 downto 0)"),
+        "wide": VhdlPort("wide", "in", "std_logic_vector", "(7 downto 0)"),
+    }
+    
+    with patch.object(TestbenchGenerator, '_convert_literal_for_port',
+                      wraps=TestbenchGenerator._convert_literal_for_port) as mock_convert:
+        assert TestbenchGenerator._convert_to_vhdl_literal("A", "data", ports) == '"1010"'
+        assert TestbenchGenerator._convert_to_vhdl_literal("A", "data", ports) == '"1010"'
+        assert TestbenchGenerator._convert_to_vhdl_literal("A", "wide", ports) == '"00001010"'
+    
+    assert mock_convert.call_count == 2
+    _literal_for_port.cache_clear()
+
+
 def test_is_properly_quoted_vhdl():
     """Test detection of properly quoted VHDL values."""
     
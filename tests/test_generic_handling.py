@@ -15,7 +15,9 @@ def test_generate_generics_string():
     ]
     
     # Test with no config (use defaults)
-    generics_str = TestbenchGenerator._generate_generics_string(generics, None)
+    generics_str = TestbenchGenerator._generate_generics_string(
+        TestbenchGenerator._resolve_generic_values(generics, None)
+    )
     
     assert "DATA_WIDTH : INTEGER := 8" in generics_str
     assert "DEPTH : INTEGER := 16" in generics_str
@@ -23,7 +25,9 @@ def test_generate_generics_string():
     
     # Test with config overrides
     config = TestbenchConfig(generics={"DATA_WIDTH": "16", "DEPTH": "32"})
-    generics_str = TestbenchGenerator._generate_generics_string(generics, config)
+    generics_str = TestbenchGenerator._generate_generics_string(
+        TestbenchGenerator._resolve_generic_values(generics, config)
+    )
     
     assert "DATA_WIDTH : INTEGER := 16" in generics_str  # Overridden
     assert "DEPTH : INTEGER := 32" in generics_str       # Overridden
@@ -39,7 +43,9 @@ def test_generate_generic_map():
     
     # Test with config values
     config = TestbenchConfig(generics={"DATA_WIDTH": "32", "FIFO_DEPTH": "64"})
-    generic_map = TestbenchGenerator._generate_generic_map(generics, config)
+    generic_map = TestbenchGenerator._generate_generic_map(
+        TestbenchGenerator._resolve_generic_values(generics, config)
+    )
     
     assert "DATA_WIDTH => 32" in generic_map
     assert "FIFO_DEPTH => 64" in generic_map
@@ -165,8 +171,39 @@ def test_generic_case_insensitive_matching():
         "buffer_depth": "64"    # lowercase config for uppercase VHDL
     })
     
-    generic_map = TestbenchGenerator._generate_generic_map(generics, config)
+    generic_map = TestbenchGenerator._generate_generic_map(
+        TestbenchGenerator._resolve_generic_values(generics, config)
+    )
     
     # Should find matches despite case differences
     assert "data_width => 32" in generic_map
     assert "BUFFER_DEPTH => 64" in generic_map
+
+
+def test_generic_range_resolution_matches_whole_names():
+    """Test that range substitution replaces whole generic names only."""
+    entity = VhdlEntity(
+        name="fifo",
+        generics=[
+            VhdlGeneric("w", "integer", "4"),
+            VhdlGeneric("data_w", "integer", "8")
+        ],
+        ports=[VhdlPort("din", "in", "std_logic_vector", "(data_w-1 downto 0)")]
+    )
+    
+    config = TestbenchConfig(generics={"W": 2})
+    testbench_data = TestbenchGenerator.generate_testbench_data(entity, config)
+    
+    assert "din : IN STD_LOGIC_VECTOR(8-1 downto 0)" in testbench_data.ports
+    assert "signal tb_din : STD_LOGIC_VECTOR(8-1 downto 0)" in testbench_data.internal_signals
+
+
+def test_generic_range_resolver_substitutes_each_range_once():
+    """Test that repeated range strings reuse the first substitution."""
+    generics = [VhdlGeneric("WIDTH", "integer", "16")]
+    resolve_range = TestbenchGenerator._generic_range_resolver(generics, None)
+    
+    first = resolve_range("(WIDTH-1 downto 0)")
+    assert first == "(16-1 downto 0)"
+    assert resolve_range("(WIDTH-1 downto 0)") is first
+    assert resolve_range("(2*WIDTH-1 downto 0)") == "(2*16-1 downto 0)"
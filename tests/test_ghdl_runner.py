@@ -4,17 +4,50 @@ import pytest
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 
-from autobench.ghdl_runner import GHDLRunner, TestResult, SimulationResult, run_ghdl_simulation
+from autobench.ghdl_runner import (
+    GHDLRunner, TestResult, SimulationResult, run_ghdl_simulation, run_ghdl_simulations,
+    reset_ghdl_probe, SIMULATION_ERROR_TAIL_LINES
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_ghdl_probe():
+    """Make every test start without a cached GHDL availability result."""
+    reset_ghdl_probe()
+    yield
+    reset_ghdl_probe()
 
 
 def test_ghdl_check_available():
     """Test GHDL availability check."""
     runner = GHDLRunner()
     
-    # Mock successful GHDL check
-    with patch('subprocess.run') as mock_run:
-        mock_run.return_value.returncode = 0
+    # Mock GHDL found on PATH
+    with patch('shutil.which') as mock_which:
+        mock_which.return_value = "/usr/bin/ghdl"
         assert runner.check_ghdl_available() == True
+        mock_which.assert_called_once_with("ghdl")
+    
+    # Result is cached for the rest of the process
+    with patch('shutil.which') as mock_which:
+        assert GHDLRunner().check_ghdl_available() == True
+        mock_which.assert_not_called()
+    
+    reset_ghdl_probe()
+    
+    # Mock GHDL not available
+    with patch('shutil.which') as mock_which:
+        mock_which.return_value = None
+        assert runner.check_ghdl_available() == False
+
+
+def test_get_ghdl_version():
+    """Test GHDL version lookup for diagnostics."""
+    runner = GHDLRunner()
+    
+    with patch('subprocess.run') as mock_run:
+        mock_run.return_value = MagicMock(returncode=0, stdout="GHDL 3.0.0\n")
+        assert runner.get_ghdl_version() == "GHDL 3.0.0"
         mock_run.assert_called_once_with(
             ["ghdl", "--version"], 
             capture_output=True, 
@@ -22,10 +55,9 @@ def test_ghdl_check_available():
             timeout=10
         )
     
-    # Mock GHDL not available
     with patch('subprocess.run') as mock_run:
         mock_run.side_effect = FileNotFoundError()
-        assert runner.check_ghdl_available() == False
+        assert runner.get_ghdl_version() is None
 
 
 def test_parse_test_results():
@@ -56,6 +88,25 @@ testbench.vhd:60:9:@300ns:(note): Test 3: reset successful
     assert results[2].severity == "note"
 
 
+def test_parse_test_results_bare_assertion_lines():
+    """Test that bare assertion lines survive the substring prefilter."""
+    runner = GHDLRunner()
+    
+    ghdl_output = """
+simulation started
+  ASSERTION ERROR in Test 4: unexpected output
+error: no assertion here
+failure without the keyword
+    """
+    
+    results = runner._parse_test_results(ghdl_output)
+    
+    assert len(results) == 2
+    assert results[0].message == "ASSERTION ERROR in Test 4: unexpected output"
+    assert results[0].passed == False
+    assert results[1].message == "error: no assertion here"
+
+
 def test_extract_test_name():
     """Test extraction of test names from messages."""
     runner = GHDLRunner()
@@ -87,25 +138,30 @@ def test_is_passing_assertion():
     assert runner._is_passing_assertion("Data corruption detected", "failure") == False
 
 
+@patch('shutil.which', return_value="/usr/bin/ghdl")
+@patch('subprocess.Popen')
 @patch('subprocess.run')
-def test_compile_and_simulate_success(mock_run):
+def test_compile_and_simulate_success(mock_run, mock_popen, mock_which):
     """Test successful compilation and simulation."""
     runner = GHDLRunner()
     
     # Mock successful subprocess calls
     mock_run.side_effect = [
-        # ghdl --version check
-        MagicMock(returncode=0),
-        # ghdl -a entity.vhd
-        MagicMock(returncode=0, stderr=""),
-        # ghdl -a testbench.vhd  
+        # ghdl -a entity.vhd testbench.vhd
         MagicMock(returncode=0, stderr=""),
         # ghdl -e testbench
-        MagicMock(returncode=0, stderr=""),
-        # ghdl -r testbench
-        MagicMock(returncode=0, stdout="Simulation completed\n", stderr="")
+        MagicMock(returncode=0, stderr="")
     ]
     
+    # ghdl -r testbench (streamed)
+    mock_popen.return_value = MagicMock(
+        stdout=iter([
+            "testbench.vhd:45:9:@100ns:(note): Test 1: reset successful\n",
+            "Simulation completed\n"
+        ]),
+        wait=Mock(return_value=0)
+    )
+    
     entity_file = Path("entity.vhd")
     testbench_file = Path("testbench.vhd")
     
@@ -116,18 +172,96 @@ def test_compile_and_simulate_success(mock_run):
     assert result.success == True
     assert len(result.errors) == 0
     assert "Simulation completed" in result.simulation_output
+    assert len(result.test_results) == 1
+    assert result.test_results[0].passed == True
+    
+    # Both files are analyzed by a single GHDL invocation, entity first
+    analyze_cmd = mock_run.call_args_list[0].args[0]
+    assert analyze_cmd == ["ghdl", "-a", "--std=08", "entity.vhd", "testbench.vhd"]
+
+
+@patch('shutil.which', return_value="/usr/bin/ghdl")
+@patch('subprocess.Popen')
+@patch('subprocess.run')
+def test_compile_and_simulate_without_capture(mock_run, mock_popen, mock_which):
+    """Test that uncaptured runs drop output on success and keep a short tail on failure."""
+    runner = GHDLRunner()
+    log = [f"line {i}\n" for i in range(100)]
+    
+    for returncode in (0, 1):
+        mock_run.side_effect = [
+            MagicMock(returncode=0, stderr="analyze warnings"),
+            MagicMock(returncode=0, stderr="")
+        ]
+        mock_popen.return_value = MagicMock(stdout=iter(log), wait=Mock(return_value=returncode))
+        runner._analyzed_files.clear()
+        
+        result = runner.compile_and_simulate(
+            Path("entity.vhd"), Path("testbench.vhd"), "entity", "testbench",
+            capture_output=False
+        )
+        
+        if returncode == 0:
+            assert result.success == True
+            assert result.simulation_output == ""
+            assert result.compilation_output == ""
+        else:
+            assert result.success == False
+            assert result.errors == ["".join(log[-SIMULATION_ERROR_TAIL_LINES:])]
 
 
+@patch('subprocess.Popen')
+def test_run_simulation_waveform_formats(mock_popen, tmp_path):
+    """Test waveform options passed to ghdl -r for each format."""
+    runner = GHDLRunner(tmp_path)
+    
+    runner._run_simulation("counter_tb", waveform_format="fst")
+    cmd = mock_popen.call_args.args[0]
+    assert f"--fst={tmp_path / 'counter_tb.fst'}" in cmd
+    assert "--ieee-asserts=disable-at-0" in cmd
+    
+    runner._run_simulation("counter_tb", waveform_format="vcd")
+    assert f"--vcd={tmp_path / 'counter_tb.vcd'}" in mock_popen.call_args.args[0]
+    
+    runner._run_simulation("counter_tb", waveform_format="none")
+    cmd = mock_popen.call_args.args[0]
+    assert not any(arg.startswith(("--wave=", "--vcd=", "--fst=")) for arg in cmd)
+    
+    with pytest.raises(ValueError, match="Unsupported waveform format"):
+        runner._run_simulation("counter_tb", waveform_format="lxt")
+
+
+def test_stream_simulation_output_keeps_full_log_unless_bounded():
+    """Test that streamed output is kept whole by default and tail-bounded on request."""
+    runner = GHDLRunner()
+    
+    output_lines = [f"line {i}\n" for i in range(SIMULATION_ERROR_TAIL_LINES + 50)]
+    output_lines.insert(10, "tb.vhd:1:1:@5ns:(error): Test 7: data mismatch\n")
+    
+    test_results, simulation_output = runner._stream_simulation_output(MagicMock(stdout=iter(output_lines)))
+    assert [t.test_name for t in test_results] == ["Test 7"]
+    assert simulation_output == "".join(output_lines)
+    
+    test_results, simulation_output = runner._stream_simulation_output(
+        MagicMock(stdout=iter(output_lines)), SIMULATION_ERROR_TAIL_LINES
+    )
+    
+    # Early assertion is still parsed even though it falls out of the tail
+    assert [t.test_name for t in test_results] == ["Test 7"]
+    assert "line 0\n" not in simulation_output
+    assert simulation_output.endswith(output_lines[-1])
+    assert simulation_output.count("\n") == SIMULATION_ERROR_TAIL_LINES
+
+
+@patch('shutil.which', return_value="/usr/bin/ghdl")
 @patch('subprocess.run')  
-def test_compile_and_simulate_compilation_failure(mock_run):
+def test_compile_and_simulate_compilation_failure(mock_run, mock_which):
     """Test compilation failure handling."""
     runner = GHDLRunner()
     
-    # Mock GHDL available check + compilation failure
+    # Mock compilation failure
     mock_run.side_effect = [
-        # ghdl --version check
-        MagicMock(returncode=0),
-        # ghdl -a entity.vhd fails
+        # ghdl -a entity.vhd testbench.vhd fails on the entity
         MagicMock(returncode=1, stderr="entity.vhd:10:15: syntax error")
     ]
     
@@ -141,6 +275,104 @@ def test_compile_and_simulate_compilation_failure(mock_run):
     assert result.success == False
     assert len(result.errors) > 0
     assert "syntax error" in result.errors[0]
+    assert result.errors[0].startswith("Failed to compile entity")
+
+
+@patch('shutil.which', return_value="/usr/bin/ghdl")
+@patch('subprocess.run')
+def test_compile_and_simulate_testbench_compilation_failure(mock_run, mock_which):
+    """Test that analysis errors in the testbench are attributed to it."""
+    runner = GHDLRunner()
+    
+    mock_run.side_effect = [
+        MagicMock(returncode=1, stderr="testbench.vhd:3:1: unknown identifier")
+    ]
+    
+    result = runner.compile_and_simulate(
+        Path("entity.vhd"), Path("testbench.vhd"), "entity", "testbench"
+    )
+    
+    assert result.success == False
+    assert result.errors[0].startswith("Failed to compile testbench")
+
+
+@patch('shutil.which', return_value="/usr/bin/ghdl")
+@patch('subprocess.Popen')
+@patch('subprocess.run')
+def test_compile_and_simulate_skips_unchanged_files(mock_run, mock_popen, mock_which, tmp_path):
+    """Test that a reused runner only re-analyzes files that changed."""
+    import os
+    
+    entity_file = tmp_path / "entity.vhd"
+    testbench_file = tmp_path / "testbench.vhd"
+    entity_file.write_text("entity entity is end entity;")
+    testbench_file.write_text("entity testbench is end entity;")
+    (tmp_path / "work-obj08.cf").write_text("")
+    
+    runner = GHDLRunner(tmp_path)
+    mock_run.return_value = MagicMock(returncode=0, stderr="")
+    mock_popen.side_effect = lambda *args, **kwargs: MagicMock(stdout=iter([]), wait=Mock(return_value=0))
+    
+    def analyze_commands():
+        return [c.args[0] for c in mock_run.call_args_list if c.args[0][1] == "-a"]
+    
+    runner.compile_and_simulate(entity_file, testbench_file, "entity", "testbench")
+    assert analyze_commands() == [["ghdl", "-a", "--std=08", str(entity_file), str(testbench_file)]]
+    
+    # Nothing changed: analysis is skipped entirely
+    mock_run.reset_mock()
+    result = runner.compile_and_simulate(entity_file, testbench_file, "entity", "testbench")
+    assert result.success == True
+    assert analyze_commands() == []
+    
+    # Only the testbench changed
+    mock_run.reset_mock()
+    stat = testbench_file.stat()
+    os.utime(testbench_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    runner.compile_and_simulate(entity_file, testbench_file, "entity", "testbench")
+    assert analyze_commands() == [["ghdl", "-a", "--std=08", str(testbench_file)]]
+
+
+@patch('shutil.which', return_value="/usr/bin/ghdl")
+@patch('subprocess.Popen')
+@patch('subprocess.run')
+def test_compile_and_simulate_reanalyzes_when_file_set_changes(mock_run, mock_popen, mock_which, tmp_path):
+    """Test that switching to another file set never reuses units from the previous one."""
+    entity_a = tmp_path / "a.vhd"
+    entity_b = tmp_path / "b.vhd"
+    testbench_file = tmp_path / "testbench.vhd"
+    entity_a.write_text("entity counter is end entity;")
+    entity_b.write_text("entity counter is end entity; -- alternative")
+    testbench_file.write_text("entity testbench is end entity;")
+    (tmp_path / "work-obj08.cf").write_text("")
+    
+    runner = GHDLRunner(tmp_path)
+    mock_run.return_value = MagicMock(returncode=0, stderr="")
+    mock_popen.side_effect = lambda *args, **kwargs: MagicMock(stdout=iter([]), wait=Mock(return_value=0))
+    
+    def analyzed_files():
+        commands = [c.args[0] for c in mock_run.call_args_list if c.args[0][1] == "-a"]
+        mock_run.reset_mock()
+        return [arg for command in commands for arg in command[3:]]
+    
+    for entity_file in (entity_a, entity_b, entity_a):
+        runner.compile_and_simulate(entity_file, testbench_file, "counter", "testbench")
+        assert analyzed_files() == [str(entity_file), str(testbench_file)]
+    
+    # An analysis of just the entity (as prewarm does) is extended, not redone
+    runner._analyzed_files.clear()
+    assert runner.prewarm(entity_b)
+    assert analyzed_files() == [str(entity_b)]
+    runner.compile_and_simulate(entity_b, testbench_file, "counter", "testbench")
+    assert analyzed_files() == [str(testbench_file)]
+    
+    # A rewrite that keeps the mtime is still detected through the size
+    import os
+    stat = entity_b.stat()
+    entity_b.write_text("entity counter is end entity; -- alternative, longer")
+    os.utime(entity_b, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    runner.compile_and_simulate(entity_b, testbench_file, "counter", "testbench")
+    assert analyzed_files() == [str(entity_b), str(testbench_file)]
 
 
 def test_cleanup_work_files():
@@ -156,6 +388,20 @@ def test_cleanup_work_files():
     assert True
 
 
+def test_cleanup_work_files_removes_only_ghdl_artifacts(tmp_path):
+    """Test that cleanup removes GHDL artifacts and leaves other files."""
+    runner = GHDLRunner(tmp_path)
+    
+    artifacts = ["work-obj08.cf", "work-obj93.cf", "e~counter_tb.o", "counter_tb.exe"]
+    kept = ["counter.vhd", "counter_tb.ghw", "helper.o", "work-obj08.cf.bak"]
+    for name in artifacts + kept:
+        (tmp_path / name).write_text("")
+    
+    runner.cleanup_work_files()
+    
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(kept)
+
+
 @patch('autobench.ghdl_runner.GHDLRunner')
 def test_run_ghdl_simulation_convenience_function(mock_runner_class):
     """Test the convenience function for running simulations."""
@@ -184,3 +430,26 @@ def test_run_ghdl_simulation_convenience_function(mock_runner_class):
     assert result.success == True
     assert result.waveform_file == Path("test.ghw")
     mock_runner.cleanup_work_files.assert_called_once()
+
+
+@patch('autobench.ghdl_runner.run_ghdl_simulation')
+def test_run_ghdl_simulations_uses_one_work_dir_per_unit(mock_simulate, tmp_path):
+    """Test that batch simulations keep unit order and never share a work library."""
+    mock_simulate.side_effect = lambda **kwargs: SimulationResult(
+        success=True,
+        compilation_output="",
+        simulation_output=kwargs["testbench_name"],
+        test_results=[]
+    )
+    units = [
+        (Path("a.vhd"), Path("a_tb.vhd"), "a", "a_tb"),
+        (Path("b.vhd"), Path("b_tb.vhd"), "b", "b_tb"),
+        (Path("c.vhd"), Path("c_tb.vhd"), "c", "c_tb"),
+    ]
+    
+    results = run_ghdl_simulations(units, work_dir=tmp_path, max_workers=3)
+    
+    assert [r.simulation_output for r in results] == ["a_tb", "b_tb", "c_tb"]
+    calls = sorted(mock_simulate.call_args_list, key=lambda c: c.kwargs["testbench_name"])
+    assert [c.kwargs["work_dir"] for c in calls] == [tmp_path / "unit_0", tmp_path / "unit_1", tmp_path / "unit_2"]
+    assert all(c.kwargs["entity_file"].is_absolute() for c in calls)
@@ -0,0 +1,212 @@
+"""Tests for the command line interface."""
+
+import pytest
+from pathlib import Path
+from unittest.mock import Mock, patch
+from autobench.main import main
+from autobench import ghdl_runner
+from autobench.ghdl_runner import SimulationResult
+
+
+COUNTER_VHDL = """
+entity counter is
+    port (
+        clk : in std_logic;
+        count : out integer
+    );
+end entity;
+"""
+
+COUNTER_TB_VHDL = """
+entity counter_tb is
+end entity;
+"""
+
+
+@pytest.fixture
+def counter_file(tmp_path, monkeypatch):
+    """Write a counter entity and run the CLI from its directory."""
+    monkeypatch.chdir(tmp_path)
+    vhdl_file = tmp_path / "counter.vhd"
+    vhdl_file.write_text(COUNTER_VHDL, encoding='utf-8')
+    return vhdl_file
+
+
+def test_main_without_arguments_prints_help(capsys):
+    """Test that a bare invocation shows help and succeeds."""
+    assert main([]) == 0
+    assert "usage: autobench" in capsys.readouterr().out
+
+
+def test_main_missing_input_exits_with_usage_error(tmp_path, capsys):
+    """Test that a missing input path is an argparse usage error."""
+    with pytest.raises(SystemExit) as excinfo:
+        main(["-i", str(tmp_path / "missing.vhd")])
+    
+    assert excinfo.value.code == 2
+    assert "does not exist" in capsys.readouterr().err
+
+
+def test_generate_template_writes_entity_file(tmp_path, monkeypatch, capsys):
+    """Test that generate-template writes <entity_name>.vhd to the working directory."""
+    monkeypatch.chdir(tmp_path)
+    
+    assert main(["generate-template", "uart_rx", "-v"]) == 0
+    
+    assert "entity uart_rx is" in (tmp_path / "uart_rx.vhd").read_text(encoding='utf-8')
+    out = capsys.readouterr().out
+    assert "Generated VHDL template file: uart_rx.vhd" in out
+    assert "autobench -i uart_rx.vhd -g" in out
+
+
+def test_generate_config_then_testbench_uses_default_config(counter_file, tmp_path, capsys):
+    """Test that -g writes a baseline config that a later -i run picks up."""
+    assert main(["-i", str(counter_file), "-g"]) == 0
+    assert (tmp_path / "counter_config.toml").exists()
+    assert "Generated baseline configuration file: counter_config.toml" in capsys.readouterr().out
+    
+    assert main(["-i", str(counter_file), "-v"]) == 0
+    
+    assert "entity counter_tb is" in (tmp_path / "counter_tb.vhd").read_text(encoding='utf-8')
+    out = capsys.readouterr().out
+    assert "Parsed entity: counter" in out
+    assert "Found default config: counter_config.toml" in out
+    assert "Testbench generated successfully: counter_tb.vhd" in out
+
+
+def test_generate_testbench_with_pass_through_template(counter_file, tmp_path):
+    """Test that a CRLF template without fields is written with normalized newlines."""
+    template_file = tmp_path / "plain_tb.vhd"
+    template_file.write_bytes(b"-- no fields\r\nentity tb is\rend entity;\r\n")
+    
+    assert main(["-i", str(counter_file), "-t", str(template_file)]) == 0
+    
+    output = (tmp_path / "counter_tb.vhd").read_text(encoding='utf-8')
+    assert output == "-- no fields\nentity tb is\nend entity;\n"
+
+
+def test_generate_testbench_reports_parse_errors(tmp_path, monkeypatch, capsys):
+    """Test that a file without an entity fails with exit code 1."""
+    monkeypatch.chdir(tmp_path)
+    vhdl_file = tmp_path / "empty.vhd"
+    vhdl_file.write_text("-- nothing here\n", encoding='utf-8')
+    
+    assert main(["-i", str(vhdl_file)]) == 1
+    assert "Error:" in capsys.readouterr().err
+    assert not list(tmp_path.glob("*_tb.vhd"))
+
+
+def test_generate_ai_config_saves_streamed_config(counter_file, tmp_path, mock_genai_client, capsys):
+    """Test that generate-ai-config saves the config streamed back by the model."""
+    mock_client = Mock()
+    mock_client.models.generate_content_stream.return_value = iter(
+        [Mock(text="```toml\nclock_period_ns = 25\n```")]
+    )
+    mock_genai_client.return_value = mock_client
+    
+    assert main(["generate-ai-config", str(counter_file), "--project-id", "test-project"]) == 0
+    
+    assert "clock_period_ns = 25" in (tmp_path / "counter_ai_config.toml").read_text(encoding='utf-8')
+    assert "AI-generated configuration saved to: counter_ai_config.toml" in capsys.readouterr().out
+    mock_genai_client.assert_called_once_with(vertexai=True, project="test-project", location="us-central1")
+
+
+def test_generate_ai_config_without_project_id_fails(counter_file, monkeypatch, mock_genai_client, capsys):
+    """Test that a missing project ID is reported with setup instructions."""
+    monkeypatch.delenv("GOOGLE_CLOUD_PROJECT", raising=False)
+    
+    assert main(["generate-ai-config", str(counter_file)]) == 1
+    
+    assert "Google Cloud project ID required" in capsys.readouterr().err
+    mock_genai_client.assert_not_called()
+
+
+def test_generate_ai_config_reports_request_failure(counter_file, tmp_path, mock_genai_client, capsys):
+    """Test that a failed AI request returns exit code 1 and writes nothing."""
+    mock_client = Mock()
+    mock_client.models.generate_content_stream.side_effect = RuntimeError("permission denied")
+    mock_genai_client.return_value = mock_client
+    
+    assert main(["generate-ai-config", str(counter_file), "--project-id", "test-project"]) == 1
+    
+    assert "permission denied" in capsys.readouterr().err
+    assert not (tmp_path / "counter_ai_config.toml").exists()
+
+
+@pytest.fixture
+def simulate_files(counter_file, tmp_path):
+    """Entity and testbench files for the simulate subcommand."""
+    testbench_file = tmp_path / "counter_tb.vhd"
+    testbench_file.write_text(COUNTER_TB_VHDL, encoding='utf-8')
+    return counter_file, testbench_file
+
+
+def test_simulate_reports_test_results(simulate_files, capsys):
+    """Test that simulate auto-detects entity names and prints per-test results."""
+    entity_file, testbench_file = simulate_files
+    result = SimulationResult(
+        success=True,
+        compilation_output="",
+        simulation_output="",
+        test_results=[
+            ghdl_runner.TestResult("Test 1", True, "ok", time="10ns"),
+            ghdl_runner.TestResult("Test 2", False, "count mismatch", time="20ns"),
+        ],
+        waveform_file=Path("counter_tb.vcd"),
+    )
+    
+    with patch('autobench.ghdl_runner.run_ghdl_simulation', return_value=result) as mock_run:
+        assert main([
+            "simulate", str(entity_file), str(testbench_file),
+            "--waveform-format", "vcd", "--sim-time", "1us", "-v"
+        ]) == 0
+    
+    kwargs = mock_run.call_args.kwargs
+    assert (kwargs["entity_name"], kwargs["testbench_name"]) == ("counter", "counter_tb")
+    assert kwargs["waveform_format"] == "vcd"
+    assert kwargs["simulation_time"] == "1us"
+    assert kwargs["capture_output"] is True
+    
+    out = capsys.readouterr().out
+    assert "Entity: counter" in out
+    assert "Test Results: 1/2 passed" in out
+    assert "PASS: Test 1 @10ns" in out
+    assert "FAIL: Test 2 @20ns" in out
+    assert "count mismatch" in out
+    assert "Waveform saved: counter_tb.vcd" in out
+
+
+def test_simulate_failure_returns_error_code(simulate_files, capsys):
+    """Test that a failed simulation returns exit code 1 and shows logs with -v."""
+    entity_file, testbench_file = simulate_files
+    result = SimulationResult(
+        success=False,
+        compilation_output="analyze ok",
+        simulation_output="bound check failure at 30ns",
+        test_results=[],
+        errors=["Simulation failed"],
+    )
+    
+    with patch('autobench.ghdl_runner.run_ghdl_simulation', return_value=result) as mock_run:
+        assert main([
+            "simulate", str(entity_file), str(testbench_file),
+            "--entity-name", "counter", "--testbench-name", "counter_tb", "--no-waveform", "-v"
+        ]) == 1
+    
+    assert mock_run.call_args.kwargs["generate_waveform"] is False
+    captured = capsys.readouterr()
+    assert "Simulation failed" in captured.err
+    assert "bound check failure at 30ns" in captured.out
+
+
+def test_simulate_reports_undetectable_entity(simulate_files, tmp_path, capsys):
+    """Test that simulate fails before running GHDL when a name cannot be detected."""
+    _, testbench_file = simulate_files
+    bad_file = tmp_path / "bad.vhd"
+    bad_file.write_text("-- no entity\n", encoding='utf-8')
+    
+    with patch('autobench.ghdl_runner.run_ghdl_simulation') as mock_run:
+        assert main(["simulate", str(bad_file), str(testbench_file)]) == 1
+    
+    mock_run.assert_not_called()
+    assert "Could not auto-detect entity name" in capsys.readouterr().err
@@ -105,6 +105,7 @@ def test_round_trip_with_optional_sections():
     rebuilt_config = TestbenchConfig.from_dict(config_dict)
     
     # Should be identical
+    assert rebuilt_config == original_config
     assert rebuilt_config.clock_period_ns == original_config.clock_period_ns
     assert len(rebuilt_config.test_vectors) == len(original_config.test_vectors)
     
@@ -0,0 +1,98 @@
+"""Tests for the on-disk parse cache."""
+
+import pytest
+from unittest.mock import patch
+
+from autobench import parse_cache
+from autobench.parse_cache import parse_file_cached, parse_file_memoized, try_parse_file
+from autobench.vhdl_parser import VhdlParser
+
+
+COUNTER_VHDL = """
+entity counter is
+  port (
+    clk : in STD_LOGIC;
+    count : out STD_LOGIC_VECTOR(7 downto 0)
+  );
+end entity counter;
+"""
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the parse cache at a private directory."""
+    directory = tmp_path / "cache"
+    monkeypatch.setattr(parse_cache, "CACHE_DIR", directory)
+    monkeypatch.delenv("AUTOBENCH_NO_CACHE", raising=False)
+    return directory
+
+
+def test_parse_file_cached_reuses_entity_for_same_content(cache_dir, tmp_path):
+    """Test that a second parse of unchanged content is served from the cache."""
+    vhdl_file = tmp_path / "counter.vhd"
+    vhdl_file.write_text(COUNTER_VHDL, encoding='utf-8')
+
+    first = parse_file_cached(vhdl_file)
+    assert len(list(cache_dir.glob("*.pkl"))) == 1
+
+    with patch.object(VhdlParser, 'parse_content') as mock_parse:
+        second = parse_file_cached(vhdl_file)
+
+    mock_parse.assert_not_called()
+    assert second == first
+    assert second.name == "counter"
+
+    # Changed content misses the cache
+    vhdl_file.write_text(COUNTER_VHDL.replace("counter", "timer"), encoding='utf-8')
+    assert parse_file_cached(vhdl_file).name == "timer"
+    assert len(list(cache_dir.glob("*.pkl"))) == 2
+
+
+def test_parse_file_cached_can_be_disabled(cache_dir, tmp_path, monkeypatch):
+    """Test that AUTOBENCH_NO_CACHE=1 bypasses the cache entirely."""
+    monkeypatch.setenv("AUTOBENCH_NO_CACHE", "1")
+    vhdl_file = tmp_path / "counter.vhd"
+    vhdl_file.write_text(COUNTER_VHDL, encoding='utf-8')
+
+    assert parse_file_cached(vhdl_file).name == "counter"
+    assert not cache_dir.exists()
+
+
+def test_parse_file_cached_errors_match_parser(cache_dir, tmp_path):
+    """Test that missing and invalid files raise the parser's errors."""
+    with pytest.raises(FileNotFoundError, match="File not found"):
+        parse_file_cached(tmp_path / "missing.vhd")
+
+    bad_file = tmp_path / "bad.vhd"
+    bad_file.write_text("architecture rtl of nothing is begin end;", encoding='utf-8')
+    with pytest.raises(RuntimeError, match="Failed to parse VHDL file"):
+        parse_file_cached(bad_file)
+
+
+def test_parse_file_memoized_parses_once_per_stat_signature(cache_dir, tmp_path):
+    """Test that repeated in-process parses of an unchanged file are memoized."""
+    parse_cache._parse_memo.cache_clear()
+    vhdl_file = tmp_path / "counter.vhd"
+    vhdl_file.write_text(COUNTER_VHDL, encoding='utf-8')
+
+    with patch('autobench.parse_cache.parse_file_cached', wraps=parse_file_cached) as mock_cached:
+        first = parse_file_memoized(vhdl_file)
+        second = parse_file_memoized(vhdl_file)
+
+    assert second is first
+    assert mock_cached.call_count == 1
+    parse_cache._parse_memo.cache_clear()
+
+
+def test_try_parse_file_reports_errors_without_raising(cache_dir, tmp_path):
+    """Test that try_parse_file returns an error message instead of raising."""
+    vhdl_file = tmp_path / "counter.vhd"
+    vhdl_file.write_text(COUNTER_VHDL, encoding='utf-8')
+
+    entity, error = try_parse_file(vhdl_file)
+    assert entity.name == "counter"
+    assert error is None
+
+    entity, error = try_parse_file(tmp_path / "missing.vhd")
+    assert entity is None
+    assert "File not found" in error
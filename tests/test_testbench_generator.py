@@ -1,12 +1,14 @@
 """Tests for testbench generator."""
 
 import pytest
+from dataclasses import FrozenInstanceError, asdict
 from autobench.vhdl_parser import VhdlEntity, VhdlGeneric, VhdlPort
 from autobench.config import TestbenchConfig
 from autobench.testbench_generator import TestbenchGenerator
+from autobench.templates import DEFAULT_TEMPLATE, load_template
 
 
-def test_testbench_generation():
+def test_testbench_generation(generate_testbench):
     """Test basic testbench generation."""
     entity = VhdlEntity(
         name="stack",
@@ -43,7 +45,7 @@ def test_testbench_generation():
         generics={"DATA_WIDTH": "32"}
     )
     
-    testbench_data = TestbenchGenerator.generate_testbench_data(entity, config)
+    testbench_data = generate_testbench(entity, config)
     
     # Check that ranges are resolved (the parser converts generic names to lowercase)
     assert "(32-1 downto 0)" in testbench_data.ports
@@ -51,17 +53,17 @@ def test_testbench_generation():
     assert testbench_data.component_name == "stack"
 
 
-def test_clock_generation():
+def test_clock_generation(generate_testbench):
     """Test clock generation with different periods."""
     entity = VhdlEntity(name="test", generics=[], ports=[])
     
     config = TestbenchConfig(clock_period_ns=20)
-    testbench_data = TestbenchGenerator.generate_testbench_data(entity, config)
+    testbench_data = generate_testbench(entity, config)
     
     assert "wait for 10 ns" in testbench_data.clk_gen
 
 
-def test_port_connections():
+def test_port_connections(generate_testbench):
     """Test port map generation."""
     ports = [
         VhdlPort("clk", "in", "STD_LOGIC"),
@@ -69,7 +71,178 @@ def test_port_connections():
     ]
     
     entity = VhdlEntity(name="test", generics=[], ports=ports)
-    testbench_data = TestbenchGenerator.generate_testbench_data(entity)
+    testbench_data = generate_testbench(entity)
     
     assert "clk => tb_clk," in testbench_data.port_connections
     assert "data => tb_data" in testbench_data.port_connections
+
+
+def test_default_template_render_matches_format():
+    """Test that the precompiled default template renders like str.format."""
+    entity = VhdlEntity(
+        name="counter",
+        generics=[VhdlGeneric("width", "integer", "8")],
+        ports=[
+            VhdlPort("clk", "in", "std_logic"),
+            VhdlPort("count", "out", "std_logic_vector", "(width-1 downto 0)")
+        ]
+    )
+    
+    testbench_data = TestbenchGenerator.generate_testbench_data(entity)
+    template = load_template()
+    
+    assert template is DEFAULT_TEMPLATE
+    assert testbench_data.apply_to_template(template) == template.format(**asdict(testbench_data))
+
+
+def test_load_template_caches_until_file_changes(tmp_path):
+    """Test that custom templates are re-read only when their mtime changes."""
+    import os
+    
+    template_file = tmp_path / "custom_tb.vhdl"
+    template_file.write_text("-- v1 {component_name}", encoding='utf-8')
+    
+    first = load_template(template_file)
+    assert load_template(template_file) is first
+    
+    template_file.write_text("-- v2 {component_name}", encoding='utf-8')
+    stat = template_file.stat()
+    os.utime(template_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    
+    assert load_template(template_file) == "-- v2 {component_name}"
+    
+    with pytest.raises(RuntimeError, match="Failed to read template file"):
+        load_template(tmp_path / "missing.vhdl")
+
+
+def test_save_vhdl_template_matches_generated_template(tmp_path):
+    """Test that the pre-encoded entity template matches generate_vhdl_template."""
+    from autobench.templates import generate_vhdl_template, save_vhdl_template
+    
+    path = tmp_path / "uart_rx.vhd"
+    save_vhdl_template("uart_rx", path)
+    
+    assert path.read_text(encoding='utf-8') == generate_vhdl_template("uart_rx")
+
+
+def test_stream_template_to_file_matches_apply_to_template(tmp_path):
+    """Test that streaming a template to disk matches in-memory rendering."""
+    from autobench.templates import stream_template_to_file
+    
+    entity = VhdlEntity(
+        name="counter",
+        generics=[],
+        ports=[VhdlPort("clk", "in", "std_logic"), VhdlPort("q", "out", "std_logic")]
+    )
+    testbench_data = TestbenchGenerator.generate_testbench_data(entity)
+    
+    for template in (DEFAULT_TEMPLATE, "-- {component_name!r:>12} {{literal}}\n{ports}"):
+        output = tmp_path / "counter_tb.vhd"
+        stream_template_to_file(template, testbench_data.template_fields(), output)
+        assert output.read_text(encoding='utf-8') == testbench_data.apply_to_template(template)
+    
+    # Unknown fields fail before the output file is touched
+    with pytest.raises(KeyError):
+        stream_template_to_file("{missing}", testbench_data.template_fields(), tmp_path / "bad_tb.vhd")
+    assert not (tmp_path / "bad_tb.vhd").exists()
+
+
+def test_render_matches_str_format():
+    """Test that plan-based rendering keeps str.format semantics."""
+    from autobench.templates import render
+    
+    mapping = {"name": "counter", "width": "8"}
+    for template in (
+        "entity {name}_tb is",
+        "{{escaped}} {name!r} {name:>10} {width:{width}}",
+        "no fields at all",
+    ):
+        assert render(template, mapping) == template.format(**mapping)
+    
+    with pytest.raises(KeyError):
+        render("{missing}", mapping)
+
+
+def test_load_template_matches_read_text(tmp_path):
+    """Test that template reads keep read_text's decoding and newline handling."""
+    template_file = tmp_path / "crlf_tb.vhdl"
+    template_file.write_bytes("-- µ {component_name}\r\nend;\rlast\n".encode('utf-8'))
+    
+    assert load_template(template_file) == template_file.read_text(encoding='utf-8')
+
+
+def test_template_emitter_only_for_plain_fields():
+    """Test that only templates with plain identifier fields are compiled to emitters."""
+    from autobench.templates import _template_emitter, render
+    
+    assert _template_emitter(DEFAULT_TEMPLATE) is not None
+    assert _template_emitter("-- {name:>8}") is None
+    assert _template_emitter("-- {ports[0]}") is None
+    
+    # Literal text with quotes and backslashes survives code generation
+    template = "report \"{name}\" & '\\n' -- '''{{x}}'''"
+    assert render(template, {"name": "counter"}) == template.format(name="counter")
+
+
+def test_render_keeps_fields_that_normalize_to_another_name():
+    """Test that NFKC-equivalent field names stay distinct, as in str.format."""
+    from autobench.templates import _template_emitter, render
+    
+    mapping = {"\ufb01eld": "L", "field": "F"}
+    for template in ("{\ufb01eld}", "{\ufb01eld} {field}"):
+        assert _template_emitter(template) is None
+        assert render(template, mapping) == template.format(**mapping)
+
+
+def test_compile_for_entity_matches_generate_testbench_data():
+    """Test that a compiled entity emitter can be reused across configs."""
+    entity = VhdlEntity(
+        name="shifter",
+        generics=[VhdlGeneric("WIDTH", "INTEGER", "8")],
+        ports=[
+            VhdlPort("clk", "in", "STD_LOGIC"),
+            VhdlPort("din", "in", "STD_LOGIC_VECTOR", "(WIDTH-1 downto 0)")
+        ]
+    )
+    emit = TestbenchGenerator.compile_for_entity(entity)
+    
+    for config in (None, TestbenchConfig(clock_period_ns=20), TestbenchConfig(generics={"WIDTH": "16"})):
+        assert emit(config) == TestbenchGenerator.generate_testbench_data(entity, config)
+    
+    assert "(16-1 downto 0)" in emit(TestbenchConfig(generics={"WIDTH": "16"})).ports
+    assert "(8-1 downto 0)" in emit().ports
+
+
+@pytest.mark.parametrize("override", [0, ""])
+def test_empty_generic_override_falls_back_to_entity_default(override):
+    """Test that an empty override is ignored consistently by generics, map and ranges."""
+    entity = VhdlEntity(
+        name="shifter",
+        generics=[VhdlGeneric("WIDTH", "INTEGER", "8"), VhdlGeneric("DEPTH", "NATURAL", None)],
+        ports=[
+            VhdlPort("din", "in", "STD_LOGIC_VECTOR", "(WIDTH-1 downto 0)"),
+            VhdlPort("addr", "in", "STD_LOGIC_VECTOR", "(DEPTH-1 downto 0)")
+        ]
+    )
+    data = TestbenchGenerator.generate_testbench_data(
+        entity, TestbenchConfig(generics={"WIDTH": override, "DEPTH": override})
+    )
+    
+    assert "WIDTH : INTEGER := 8" in data.generics
+    assert "DEPTH : NATURAL := 8" in data.generics
+    assert "WIDTH => 8" in data.generic_map
+    assert "DEPTH => 8" in data.generic_map
+    assert "(8-1 downto 0)" in data.ports
+    assert "(DEPTH-1" not in data.ports and "(32-1" not in data.ports
+
+
+def test_testbench_data_is_frozen():
+    """Test that testbench data is an immutable value object."""
+    entity = VhdlEntity(name="counter", generics=[], ports=[VhdlPort("clk", "in", "STD_LOGIC")])
+    first = TestbenchGenerator.generate_testbench_data(entity)
+    second = TestbenchGenerator.generate_testbench_data(entity)
+    
+    assert first == second
+    assert hash(first) == hash(second)
+    with pytest.raises(FrozenInstanceError):
+        first.ports = ""
@@ -2,48 +2,32 @@
 
 import pytest
 from autobench.config import _get_default_value, generate_baseline_config
-from autobench.testbench_generator import TestbenchGenerator
 from autobench.vhdl_parser import VhdlEntity, VhdlPort, VhdlGeneric
 
 
-def test_default_value_syntax():
-    """Test that default values are unquoted (quoting added during VHDL generation)."""
-    
+@pytest.mark.parametrize("signal_type, signal_range, expected", [
     # All values should be unquoted raw values
-    assert _get_default_value("std_logic", None) == "0"
-    assert _get_default_value("STD_LOGIC", None) == "0"
-    
+    ("std_logic", None, "0"),
+    ("STD_LOGIC", None, "0"),
     # Bit vectors return raw bit patterns
-    assert _get_default_value("std_logic_vector", "(7 downto 0)") == "00000000"
-    assert _get_default_value("STD_LOGIC_VECTOR", "(3 downto 0)") == "00000000"
-    
+    ("std_logic_vector", "(7 downto 0)", "00000000"),
+    ("STD_LOGIC_VECTOR", "(3 downto 0)", "00000000"),
     # Single bit vectors return simple value
-    assert _get_default_value("std_logic_vector", None) == "0"
-    
+    ("std_logic_vector", None, "0"),
     # Integer values are unquoted
-    assert _get_default_value("integer", None) == "0"
-    assert _get_default_value("INTEGER", None) == "0"
-    
+    ("integer", None, "0"),
+    ("INTEGER", None, "0"),
     # Unknown types default to simple value
-    assert _get_default_value("custom_type", None) == "0"
+    ("custom_type", None, "0"),
+])
+def test_default_value_syntax(signal_type, signal_range, expected):
+    """Test that default values are unquoted (quoting added during VHDL generation)."""
+    assert _get_default_value(signal_type, signal_range) == expected
 
 
-def test_baseline_config_syntax():
+def test_baseline_config_syntax(io_test_entity):
     """Test that baseline config generation creates simple unquoted values."""
-    entity = VhdlEntity(
-        name="test_entity",
-        generics=[],
-        ports=[
-            VhdlPort("clk", "in", "std_logic"),
-            VhdlPort("enable", "in", "std_logic"),
-            VhdlPort("data_in", "in", "std_logic_vector", "(7 downto 0)"),
-            VhdlPort("count", "in", "integer"),
-            VhdlPort("ready", "out", "std_logic"),
-            VhdlPort("data_out", "out", "std_logic_vector", "(7 downto 0)")
-        ]
-    )
-    
-    config = generate_baseline_config(entity)
+    config = generate_baseline_config(io_test_entity)
     
     # Check input values are simple unquoted values
     test_vector = config.test_vectors[0]
@@ -59,7 +43,7 @@ def test_baseline_config_syntax():
     assert test_vector.expected_outputs["data_out"] == "00000000"
 
 
-def test_testbench_signal_initialization():
+def test_testbench_signal_initialization(generate_testbench):
     """Test that testbench signals are initialized with correct syntax."""
     entity = VhdlEntity(
         name="test_entity",
@@ -72,7 +56,7 @@ def test_testbench_signal_initialization():
         ]
     )
     
-    testbench_data = TestbenchGenerator.generate_testbench_data(entity)
+    testbench_data = generate_testbench(entity)
     signals = testbench_data.internal_signals
     
     # STD_LOGIC signals should initialize with single quotes
@@ -87,7 +71,7 @@ def test_testbench_signal_initialization():
     assert "tb_count : INTEGER := 0;" in signals
 
 
-def test_basic_test_generation_syntax():
+def test_basic_test_generation_syntax(generate_testbench):
     """Test that basic test generation uses correct literal syntax."""
     entity = VhdlEntity(
         name="test_entity", 
@@ -98,7 +82,7 @@ def test_basic_test_generation_syntax():
         ]
     )
     
-    testbench_data = TestbenchGenerator.generate_testbench_data(entity)
+    testbench_data = generate_testbench(entity)
     stimulus = testbench_data.stim_proc
     
     # STD_LOGIC assignments should use single quotes
@@ -95,3 +95,69 @@ def test_missing_entity_error():
     
     with pytest.raises(ValueError, match="Could not find entity name"):
         VhdlParser.parse_content(vhdl_content)
+
+
+def test_parse_file_with_source(tmp_path):
+    """Test that the file is parsed and its source returned from one read."""
+    vhdl_content = """
+    entity blinker is
+        port (
+            clk : in std_logic;
+            led : out std_logic
+        );
+    end entity;
+    """
+    vhdl_file = tmp_path / "blinker.vhd"
+    vhdl_file.write_text(vhdl_content, encoding='utf-8')
+    
+    source, entity = VhdlParser.parse_file_with_source(vhdl_file)
+    
+    assert source == vhdl_content
+    assert entity.name == "blinker"
+    assert VhdlParser.parse_file(vhdl_file) == entity
+
+
+def test_clean_content_strips_comments_across_line_endings():
+    """Test comment removal and whitespace collapse for mixed line endings."""
+    content = "ENTITY foo IS -- trailing\r\n  PORT (clk : in std_logic);--x\rEND foo;--eof"
+    
+    assert VhdlParser._clean_content(content) == "entity foo is port (clk : in std_logic); end foo;"
+
+
+def test_port_and_generic_upper_case_spellings():
+    """Test that upper-case type spellings are precomputed and ignored by equality."""
+    port = VhdlPort("data", "in", "std_logic_vector", "(7 downto 0)")
+    generic = VhdlGeneric("width", "integer", "8")
+    
+    assert port.direction_upper == "IN"
+    assert port.signal_type_upper == "STD_LOGIC_VECTOR"
+    assert generic.generic_type_upper == "INTEGER"
+    assert port == VhdlPort("data", "in", "std_logic_vector", "(7 downto 0)")
+    assert "signal_type_upper" not in repr(port)
+
+
+def test_split_port_declarations_respects_nested_parens():
+    """Test splitting on top-level semicolons only, skipping empty declarations."""
+    content = " a : in std_logic_vector((w-1) downto 0);; b : out bit ; c : in t(f(1;2)) "
+    
+    assert VhdlParser._split_port_declarations(content) == [
+        "a : in std_logic_vector((w-1) downto 0)",
+        "b : out bit",
+        "c : in t(f(1;2))",
+    ]
+
+
+def test_port_and_generic_are_frozen_and_hashable():
+    """Test that ports and generics are immutable value objects."""
+    port = VhdlPort("clk", "in", "".join(["std_", "logic"]))
+    
+    assert hash(port) == hash(VhdlPort("clk", "in", "std_logic"))
+    assert len({port, VhdlPort("clk", "in", "std_logic")}) == 1
+    assert port.signal_type is VhdlPort("rst", "in", "std_logic").signal_type
+    with pytest.raises(AttributeError):
+        port.direction = "out"
+    
+    generic = VhdlGeneric("width", "integer", "8")
+    assert {generic: 1}[VhdlGeneric("width", "integer", "8")] == 1
+    with pytest.raises(AttributeError):
+        generic.default_value = "16"